@@ -0,0 +1,84 @@
+# app/__main__.py
+"""
+Production server.
+Usage: python -m app [--host 0.0.0.0] [--port 8000] [--workers N]
+
+Runs uvicorn with uvloop/httptools (when installed), one worker process per
+CPU core and a database pool per worker sized so that all workers together
+stay within DB_MAX_CONNECTIONS. On SIGTERM the server stops accepting
+connections, lets in-flight requests finish (up to SERVER_GRACEFUL_TIMEOUT
+seconds) and then runs the app's shutdown, which stops the job worker and
+closes the pooled connections.
+"""
+import argparse
+import importlib.util
+import os
+
+import uvicorn
+
+DB_MAX_CONNECTIONS = int(os.getenv("DB_MAX_CONNECTIONS", "60"))
+# Left for psql, migrations, standalone job workers and Supabase's own services
+DB_RESERVED_CONNECTIONS = int(os.getenv("DB_RESERVED_CONNECTIONS", "10"))
+
+# Longer than the idle timeout of the load balancer in front, so it never reuses a closed connection
+SERVER_KEEPALIVE = int(os.getenv("SERVER_KEEPALIVE", "75"))
+SERVER_BACKLOG = int(os.getenv("SERVER_BACKLOG", "2048"))
+SERVER_GRACEFUL_TIMEOUT = int(os.getenv("SERVER_GRACEFUL_TIMEOUT", "30"))
+SERVER_ACCESS_LOG = os.getenv("SERVER_ACCESS_LOG", "false").lower() in ("1", "true", "yes")
+
+
+def cpu_count() -> int:
+    # CPUs this process may run on (respects taskset/cpusets), not all CPUs of the host
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS/Windows
+        return os.cpu_count() or 1
+
+
+def pool_budget(workers: int) -> tuple[int, int]:
+    """Returns (pool_size, max_overflow) per worker process."""
+    per_worker = max(2, (DB_MAX_CONNECTIONS - DB_RESERVED_CONNECTIONS) // workers)
+    pool_size = max(1, per_worker * 3 // 4)
+    return pool_size, per_worker - pool_size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the API server")
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", "0")) or cpu_count())
+    args = parser.parse_args()
+
+    # Worker processes inherit the environment; an explicit DB_POOL_SIZE/DB_MAX_OVERFLOW wins
+    pool_size, max_overflow = pool_budget(args.workers)
+    os.environ.setdefault("DB_POOL_SIZE", str(pool_size))
+    os.environ.setdefault("DB_MAX_OVERFLOW", str(max_overflow))
+
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+    total = args.workers * (int(os.environ["DB_POOL_SIZE"]) + int(os.environ["DB_MAX_OVERFLOW"]))
+    print(
+        f"🚀 {args.workers} workers on {args.host}:{args.port} ({loop}/{http}), "
+        f"DB pool {os.environ['DB_POOL_SIZE']}+{os.environ['DB_MAX_OVERFLOW']} per worker"
+    )
+    if total > DB_MAX_CONNECTIONS - DB_RESERVED_CONNECTIONS:
+        print(f"⚠️  Workers may open up to {total} connections, DB_MAX_CONNECTIONS is {DB_MAX_CONNECTIONS}")
+
+    uvicorn.run(
+        "app.main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        loop=loop,
+        http=http,
+        backlog=SERVER_BACKLOG,
+        timeout_keep_alive=SERVER_KEEPALIVE,
+        timeout_graceful_shutdown=SERVER_GRACEFUL_TIMEOUT,
+        access_log=SERVER_ACCESS_LOG,
+        proxy_headers=True,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# app/archive.py
+"""
+Moves closed workorders (status Afgerond, unchanged for N days) and their tasks out of the hot
+`workorders`/`tasks` tables into `workorders_archive`/`tasks_archive`
+(see sql/004_archive.sql), so the tables that list endpoints scan stay small.
+
+Runs as the periodic `archive_workorders` job, or by hand:
+Usage: python -m app.archive [--days N] [--batch-size N]
+"""
+import argparse
+import asyncio
+import logging
+import os
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import SessionLocal, engine
+from app.jobs.queue import enqueue_once
+
+log = logging.getLogger(__name__)
+
+# 0 disables the periodic job
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "90"))
+ARCHIVE_INTERVAL_SECONDS = int(os.getenv("ARCHIVE_INTERVAL_SECONDS", "3600"))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "500"))
+
+# One statement per batch: pick closed workorders, move their tasks, then move them.
+# Ids already in the archive (short ids can be handed out again) are left in place:
+# moving them would delete the workorder without archiving it.
+_MOVE_BATCH = text("""
+    WITH picked AS (
+        SELECT id FROM workorders w
+        WHERE status = 'Afgerond' AND updated_at < now() - make_interval(days => :days)
+          AND NOT EXISTS (SELECT 1 FROM workorders_archive a WHERE a.id = w.id)
+        ORDER BY updated_at
+        LIMIT :batch_size
+        FOR UPDATE SKIP LOCKED
+    ), moved_tasks AS (
+        DELETE FROM tasks t USING picked p WHERE t.workorder_id = p.id
+        RETURNING t.id, t.workorder_id, t.assigned_employee_id, t.name, t.status, t.time_spent, t.created_at
+    ), archived_tasks AS (
+        INSERT INTO tasks_archive (id, workorder_id, assigned_employee_id, name, status, time_spent, created_at)
+        SELECT * FROM moved_tasks
+        ON CONFLICT (id) DO NOTHING
+    ), moved AS (
+        DELETE FROM workorders w USING picked p WHERE w.id = p.id
+        RETURNING w.id, w.vehicle, w.complaint, w.status, w.received, w.due, w.customer_id, w.created_at
+    )
+    INSERT INTO workorders_archive (id, vehicle, complaint, status, received, due, customer_id, created_at)
+    SELECT * FROM moved
+""")
+
+_CONFLICTS = text("""
+    SELECT count(*) FROM workorders w JOIN workorders_archive a USING (id)
+    WHERE w.status = 'Afgerond' AND w.updated_at < now() - make_interval(days => :days)
+""")
+
+
+async def archive_closed_workorders(
+    db: AsyncSession,
+    older_than_days: int = ARCHIVE_AFTER_DAYS,
+    batch_size: int = ARCHIVE_BATCH_SIZE,
+) -> int:
+    """Archives in batches (one transaction each) until nothing is left. Returns the number moved."""
+    total = 0
+    while True:
+        res = await db.execute(_MOVE_BATCH, {"days": older_than_days, "batch_size": batch_size})
+        await db.commit()
+        total += res.rowcount
+        if res.rowcount < batch_size:
+            break
+    log.info(f"Archived {total} closed workorders unchanged for {older_than_days} days")
+
+    conflicts = (await db.execute(_CONFLICTS, {"days": older_than_days})).scalar_one()
+    if conflicts:
+        log.warning(f"{conflicts} closed workorders not archived: their id is already in workorders_archive")
+    return total
+
+
+async def schedule_archiving(db: AsyncSession, delay_seconds: float = 0) -> None:
+    """Queues the next `archive_workorders` run unless one is already waiting."""
+    if ARCHIVE_AFTER_DAYS > 0:
+        await enqueue_once(db, "archive_workorders", delay_seconds=delay_seconds)
+        await db.commit()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Archive closed workorders")
+    parser.add_argument("--days", type=int, default=ARCHIVE_AFTER_DAYS or 90)
+    parser.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE)
+    args = parser.parse_args()
+
+    async with SessionLocal() as db:
+        moved = await archive_closed_workorders(db, args.days, args.batch_size)
+    await engine.dispose()
+    print(f"✅ Archived {moved} workorders")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
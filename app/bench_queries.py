@@ -0,0 +1,79 @@
+# app/bench_queries.py
+"""
+Per-request Python overhead of the hot queries: statement built per request
+(the old handlers) vs the pre-built statements in app/queries.py.
+
+Measures what happens before anything is sent to Postgres: statement
+construction, cache-key generation and the compiled-cache lookup, using the
+same internal path as Connection.execute. No database is needed.
+Usage: python -m app.bench_queries [--number N]
+"""
+import argparse
+import timeit
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import selectinload
+
+from app.models import Employee, Task, Workorder
+from app.queries import EMPLOYEE_BY_EMAIL, PORTAL_WORKORDER, tasks_query
+
+dialect = postgresql.asyncpg.dialect()
+compiled_cache: dict = {}
+
+
+def _prepare(stmt):
+    # What the engine does per execute before talking to the driver
+    return stmt._compile_w_cache(
+        dialect, compiled_cache=compiled_cache, column_keys=[], for_executemany=False, schema_translate_map=None
+    )
+
+
+def adhoc_employee():
+    _prepare(select(Employee).where(Employee.email == "monteur@example.com"))
+
+def prebuilt_employee():
+    _prepare(EMPLOYEE_BY_EMAIL)
+
+
+def adhoc_tasks():
+    q = select(Task)
+    q = q.where(Task.workorder_id == "a1b2c3d4")
+    q = q.where(Task.status == "Bezig")
+    _prepare(q.order_by(Task.created_at.desc()))
+
+def prebuilt_tasks():
+    stmt, _ = tasks_query("a1b2c3d4", None, "Bezig")
+    _prepare(stmt)
+
+
+def adhoc_portal():
+    _prepare(
+        select(Workorder)
+        .where(Workorder.id == "a1b2c3d4")
+        .options(selectinload(Workorder.customer), selectinload(Workorder.tasks))
+    )
+
+def prebuilt_portal():
+    _prepare(PORTAL_WORKORDER)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{'query':<22}{'per request':>14}{'hot layer':>14}{'saved':>10}")
+    for name, before, after in (
+        ("get_employee_by_email", adhoc_employee, prebuilt_employee),
+        ("list_tasks (2 filters)", adhoc_tasks, prebuilt_tasks),
+        ("portal_workorder", adhoc_portal, prebuilt_portal),
+    ):
+        before(), after()  # warm the compiled cache
+        t_before = min(timeit.repeat(before, number=args.number, repeat=3)) / args.number * 1e6
+        t_after = min(timeit.repeat(after, number=args.number, repeat=3)) / args.number * 1e6
+        print(f"{name:<22}{t_before:>11.1f} µs{t_after:>11.1f} µs{(1 - t_after / t_before) * 100:>9.0f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,104 @@
 # Placeholder for additional security utilities (e.g., role extraction)
+import hashlib
+import hmac
+import os
+import secrets
+import uuid
+from datetime import timedelta
+from typing import Optional
+
+from sqlalchemy import delete, insert, select, update, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.deps import SECRET_KEY
+from app.jobs.queue import enqueue_once
+from app.models import Employee, RefreshToken
+
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "30"))
+
+
 def has_admin_role(claims: dict) -> bool:
     role = claims.get("role") or claims.get("user_metadata", {}).get("role")
-    return role == "Admin"
\ No newline at end of file
+    return role == "Admin"
+
+
+def hash_refresh_token(token: str) -> str:
+    # Tokens are random, so a keyed hash is enough (and far cheaper than bcrypt)
+    return hmac.new(SECRET_KEY.encode("utf-8"), token.encode("utf-8"), hashlib.sha256).hexdigest()
+
+
+async def issue_refresh_token(db: AsyncSession, employee_id: int, family_id: Optional[uuid.UUID] = None) -> str:
+    """Stores a new refresh token and returns it. The caller commits."""
+    token = secrets.token_urlsafe(32)
+    await db.execute(
+        insert(RefreshToken).values(
+            employee_id=employee_id,
+            family_id=family_id or uuid.uuid4(),
+            token_hash=hash_refresh_token(token),
+            expires_at=func.now() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+        )
+    )
+    return token
+
+
+async def rotate_refresh_token(db: AsyncSession, token: str):
+    """
+    Revokes `token` and issues its successor. Returns (employee row, new token),
+    or None when the token is unknown, expired, reused or the employee is inactive.
+    """
+    token_hash = hash_refresh_token(token)
+
+    # Revoke and load the owner in one statement
+    res = await db.execute(
+        update(RefreshToken)
+        .where(
+            RefreshToken.token_hash == token_hash,
+            RefreshToken.revoked_at.is_(None),
+            RefreshToken.expires_at > func.now(),
+            RefreshToken.employee_id == Employee.id,
+        )
+        .values(revoked_at=func.now())
+        .returning(RefreshToken.family_id, Employee.id, Employee.email, Employee.role, Employee.is_active)
+        .execution_options(synchronize_session=False)
+    )
+    row = res.one_or_none()
+
+    if row is None:
+        # A token that was already rotated is being replayed: treat the family as stolen
+        await revoke_token_family(db, token)
+        await db.commit()
+        return None
+
+    if row.is_active is False:
+        await db.commit()
+        return None
+
+    new_token = await issue_refresh_token(db, row.id, row.family_id)
+    await db.commit()
+    return row, new_token
+
+
+async def revoke_token_family(db: AsyncSession, token: str) -> None:
+    """Revokes every live token descended from the same login as `token`. The caller commits."""
+    family = (
+        select(RefreshToken.family_id)
+        .where(RefreshToken.token_hash == hash_refresh_token(token))
+        .scalar_subquery()
+    )
+    await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.family_id == family, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=func.now())
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def prune_refresh_tokens(db: AsyncSession) -> None:
+    """Deletes expired tokens. Revoked ones are kept until they expire so a replay is still recognised."""
+    await db.execute(delete(RefreshToken).where(RefreshToken.expires_at < func.now()))
+    await db.commit()
+
+
+async def schedule_refresh_token_pruning(db: AsyncSession, delay_seconds: float = 0) -> None:
+    await enqueue_once(db, "prune_refresh_tokens", delay_seconds=delay_seconds)
+    await db.commit()
@@ -61,6 +61,7 @@ async def create_admin_user(email: str, password: str, name: str):
             print(f"✅ Created admin user: {email}")
         
         await session.commit()
+        print("   Running API workers pick this up within DIRECTORY_REFRESH_SECONDS (see app/directory.py)")
         print(f"\n📋 Admin Credentials:")
         print(f"   Email: {email}")
         print(f"   Role: Admin")
@@ -1,4 +1,5 @@
 import os
+from uuid import uuid4
 from dotenv import load_dotenv
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 
@@ -14,13 +15,61 @@ if not DATABASE_URL:
 if not DATABASE_URL.startswith("postgresql+asyncpg://"):
     DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://")
 
+# Statement caches:
+# - DB_STATEMENT_CACHE_SIZE: prepared statements kept per connection (asyncpg + SQLAlchemy's adapter)
+# - DB_QUERY_CACHE_SIZE: SQLAlchemy's compiled-SQL cache, shared by the engine
+# - DB_PGBOUNCER: set when connecting through a transaction-mode pooler (Supabase port 6543),
+#   which cannot keep named prepared statements across transactions
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "500"))
+DB_QUERY_CACHE_SIZE = int(os.getenv("DB_QUERY_CACHE_SIZE", "1000"))
+DB_PGBOUNCER = os.getenv("DB_PGBOUNCER", "false").lower() in ("1", "true", "yes")
+
+if DB_PGBOUNCER:
+    connect_args = {
+        "statement_cache_size": 0,
+        "prepared_statement_cache_size": 0,
+        # unique names so a statement never collides with one left on another backend
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+    }
+else:
+    connect_args = {
+        "statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+    }
+
+# Connection pool per process (SQLAlchemy defaults). `python -m app` derives these from
+# DB_MAX_CONNECTIONS and the worker count so all workers together stay under the server limit.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+
 # Create async engine
-engine = create_async_engine(DATABASE_URL, echo=False, pool_pre_ping=True)
+engine = create_async_engine(
+    DATABASE_URL,
+    echo=False,
+    pool_pre_ping=True,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    query_cache_size=DB_QUERY_CACHE_SIZE,
+    connect_args=connect_args,
+)
 
 # Create async session factory
 SessionLocal = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
 
+# Read-only work runs in autocommit mode on the same pool: no BEGIN/ROLLBACK
+# round trips and no snapshot held open between statements
+read_engine = engine.execution_options(isolation_level="AUTOCOMMIT")
+ReadSessionLocal = async_sessionmaker(read_engine, expire_on_commit=False, class_=AsyncSession)
+
 # Dependency to get DB session
 async def get_session() -> AsyncSession:
     async with SessionLocal() as session:
         yield session
+
+# Dependency for handlers that only read. Call `await db.close()` once the rows are
+# loaded so the connection goes back to the pool before the response is serialized.
+async def get_read_session() -> AsyncSession:
+    async with ReadSessionLocal() as session:
+        yield session
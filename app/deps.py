@@ -7,15 +7,16 @@ from fastapi.security import OAuth2PasswordBearer, HTTPAuthorizationCredentials,
 from jose import jwt, JWTError, ExpiredSignatureError
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 import asyncio
 # --- NEW IMPORTS (Using standalone bcrypt) ---
 import bcrypt
 # Removed: from passlib.context import CryptContext
 # ---------------------------------------------
 
-from app.db import get_session
+from app.db import get_read_session
+from app.directory import directory
 from app.models import Employee
+from app.queries import EMPLOYEE_BY_EMAIL
 
 SECRET_KEY = (os.getenv("SECRET_KEY") or "change-me-in-.env").strip()
 ALGORITHM = "HS256"
@@ -45,6 +46,7 @@ def verify_password(plain: str, hashed: str) -> bool:
 class Token(BaseModel):
     access_token: str
     token_type: str = "bearer"
+    refresh_token: Optional[str] = None  # exchange at /auth/refresh instead of logging in again
 
 class AuthedUser(BaseModel):
     user_id: int
@@ -57,12 +59,29 @@ def create_access_token(data: dict, minutes: int = ACCESS_TOKEN_EXPIRE_MINUTES)
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 async def get_employee_by_email(db: AsyncSession, email: str) -> Optional[Employee]:
-    res = await db.execute(select(Employee).where(Employee.email == email))
+    res = await db.execute(EMPLOYEE_BY_EMAIL, {"email": email})
     return res.scalar_one_or_none()
 
+async def load_active_employee(db: AsyncSession, employee_id: int, email: str) -> Optional[Employee]:
+    """
+    The employee a token belongs to, if it still exists and is active. Served from the
+    in-process directory (app/directory.py); the database is only asked on a miss.
+    Callers take the role from here, not from the token, so a demotion applies at once.
+    """
+    emp = await directory.by_email(email)
+    if emp is None:
+        # Not in this worker's copy yet, e.g. registered through another worker
+        emp = await get_employee_by_email(db, email)
+        await db.close()  # auth is done with the connection; don't hold it for the handler
+        if emp:
+            directory.invalidate()
+    if not emp or emp.id != employee_id or emp.is_active is False:
+        return None
+    return emp
+
 async def get_current_user(
     creds: HTTPAuthorizationCredentials = Security(bearer_scheme),
-    db: AsyncSession = Depends(get_session),
+    db: AsyncSession = Depends(get_read_session),
 ) -> AuthedUser:
     if not creds or creds.scheme != "Bearer":
         raise HTTPException(status_code=401, detail="Missing token",
@@ -85,16 +104,15 @@ async def get_current_user(
 
     sub = payload.get("sub")
     email = payload.get("email")
-    role = payload.get("role")
-    if not sub or not email:
+    if not sub or not email or not str(sub).isdigit():
         raise HTTPException(status_code=401, detail="Invalid token payload")
 
-    # optional: ensure the employee still exists & is active
-    emp = await get_employee_by_email(db, email)
-    if not emp or emp.id != int(sub) or emp.is_active is False:
+    # ensure the employee still exists & is active; the role comes from the employee, not the token
+    emp = await load_active_employee(db, int(sub), email)
+    if not emp:
         raise HTTPException(status_code=401, detail="User not found or inactive")
 
-    return AuthedUser(user_id=emp.id, email=emp.email, role=role)
+    return AuthedUser(user_id=emp.id, email=emp.email, role=emp.role.value)
 
 
 async def require_admin(user: AuthedUser = Depends(get_current_user)) -> AuthedUser:
@@ -0,0 +1,108 @@
+# app/directory.py
+"""
+In-process employee directory.
+
+Employees are few and read on nearly every request (get_current_user, /employees,
+assignment pickers), so each worker keeps all of them in memory. The copy is reloaded
+- after this worker changed employees (`directory.invalidate()` from the write endpoints), and
+- when the table's version (a counter bumped by a trigger on every committed change,
+  see sql/007_employee_directory.sql) changed, which a background task checks every
+  DIRECTORY_REFRESH_SECONDS. That bounds how long a change made through another
+  worker or process (e.g. create_admin) goes unnoticed.
+
+Password hashes are not kept; login still reads the employee from the database.
+"""
+import asyncio
+import logging
+import os
+from typing import Optional
+
+from sqlalchemy import select, text
+from sqlalchemy.orm import defer
+
+from app.db import ReadSessionLocal
+from app.models import Employee
+
+log = logging.getLogger(__name__)
+
+DIRECTORY_REFRESH_SECONDS = float(os.getenv("DIRECTORY_REFRESH_SECONDS", "5"))
+
+_VERSION = text("SELECT version FROM employee_directory_version")
+_ALL = select(Employee).options(defer(Employee.password_hash, raiseload=True)).order_by(Employee.id.desc())
+
+
+class EmployeeDirectory:
+    """All employees of this worker's last load, listed and by email. Entries are detached; don't modify them."""
+
+    def __init__(self, refresh_seconds: float = DIRECTORY_REFRESH_SECONDS):
+        self.refresh_seconds = refresh_seconds
+        self.version: Optional[int] = None
+        self._all: list[Employee] = []
+        self._by_email: dict[str, Employee] = {}
+        self._stale = True
+        self._lock = asyncio.Lock()
+        self._watcher: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        await self._fresh()
+        self._watcher = asyncio.create_task(self._watch())
+        log.info(f"Employee directory loaded with {len(self._all)} employees")
+
+    async def stop(self) -> None:
+        if self._watcher:
+            self._watcher.cancel()
+            await asyncio.gather(self._watcher, return_exceptions=True)
+            self._watcher = None
+
+    def invalidate(self) -> None:
+        """Reloads on the next lookup. Call after committing a change to employees."""
+        self._stale = True
+
+    async def by_email(self, email: str) -> Optional[Employee]:
+        await self._fresh()
+        return self._by_email.get(email)
+
+    async def all(self) -> list[Employee]:
+        """All employees, newest first."""
+        await self._fresh()
+        return self._all
+
+    async def _fresh(self) -> None:
+        if not self._stale:
+            return
+        async with self._lock:
+            if self._stale:
+                await self._load()
+
+    async def _load(self) -> None:
+        # Cleared first so an invalidate() during the load triggers another one
+        self._stale = False
+        try:
+            async with ReadSessionLocal() as db:
+                # Version before rows: a write in between makes the version look old, never new
+                version = (await db.execute(_VERSION)).scalar_one()
+                employees = list((await db.execute(_ALL)).scalars().all())
+        except Exception:
+            self._stale = True
+            raise
+
+        self._all = employees
+        self._by_email = {e.email: e for e in employees}
+        self.version = version
+
+    async def _watch(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_seconds)
+            try:
+                async with ReadSessionLocal() as db:
+                    version = (await db.execute(_VERSION)).scalar_one()
+                if version != self.version:
+                    self.invalidate()
+                    await self._fresh()
+            except Exception:
+                # Serving a copy of unknown age would break the staleness bound; reload on next lookup
+                self.invalidate()
+                log.exception("Employee directory refresh failed")
+
+
+directory = EmployeeDirectory()
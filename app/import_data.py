@@ -0,0 +1,302 @@
+# app/import_data.py
+"""
+Bulk import of customers, employees, workorders and tasks.
+Usage: python -m app.import_data <kind> <file.csv|file.jsonl> [--batch-size N] [--source NAME]
+
+Rows are streamed from the file in batches, COPY'd into a temporary staging
+table with asyncpg and upserted into the real table in one statement per batch.
+Every committed batch is recorded in `import_batches`, so re-running the same
+command (with the same --batch-size) after a failure skips what was already imported.
+
+Expected columns (extra columns are ignored, missing optional ones become NULL):
+- customers:  id, name, phone, email, address, created_at
+- employees:  email, name, role, password | password_hash, is_active, id
+- workorders: id, vehicle, complaint, status, received, due, customer_id, created_at
+- tasks:      id, workorder_id, name, assigned_employee_id, status, time_spent, created_at
+
+Import in that order so foreign keys resolve. Customers, employees and tasks
+without an id get the next one from the table's sequence (so re-importing such
+a file under a new --source creates duplicates); workorders need an id and
+employees an email. Plain `password` values are hashed with bcrypt in a process pool.
+"""
+import argparse
+import asyncio
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from itertools import islice
+from typing import Any, Callable, Iterator, Optional
+
+import asyncpg
+
+from app.db import DATABASE_URL
+from app.deps import hash_password
+
+
+def _text(v: Any) -> Optional[str]:
+    if v is None:
+        return None
+    v = str(v).strip()
+    return v or None
+
+def _int(v: Any) -> Optional[int]:
+    v = _text(v)
+    return int(v) if v is not None else None
+
+def _bool(v: Any) -> Optional[bool]:
+    if isinstance(v, bool):
+        return v
+    v = _text(v)
+    return v.lower() in ("1", "true", "yes", "y", "t") if v is not None else None
+
+def _date(v: Any) -> Optional[date]:
+    v = _text(v)
+    return date.fromisoformat(v[:10]) if v is not None else None
+
+def _timestamp(v: Any) -> Optional[datetime]:
+    v = _text(v)
+    return datetime.fromisoformat(v.replace("Z", "+00:00")) if v is not None else None
+
+def _task_status(v: Any) -> Optional[str]:
+    # Same normalisation as TaskCreate.normalize_status
+    v = _text(v)
+    return {"ToDo": "To do"}.get(v, v) if v is not None else None
+
+
+# kind -> (staging columns, upsert statement). {staging} is the temp table name.
+SPECS: dict[str, tuple[list[tuple[str, str, Callable[[Any], Any]]], str]] = {
+    "customers": (
+        [
+            ("id", "bigint", _int),
+            ("name", "text", _text),
+            ("phone", "text", _text),
+            ("email", "text", _text),
+            ("address", "text", _text),
+            ("created_at", "timestamptz", _timestamp),
+        ],
+        """
+        INSERT INTO customers (id, name, phone, email, address, created_at)
+        SELECT DISTINCT ON (id) id, name, phone, email, address, coalesce(created_at, now())
+        FROM (
+            SELECT coalesce(id, nextval(pg_get_serial_sequence('customers', 'id')::regclass)) AS id,
+                name, phone, email, address, created_at
+            FROM {staging}
+        ) s ORDER BY id
+        ON CONFLICT (id) DO UPDATE SET
+            name = EXCLUDED.name, phone = EXCLUDED.phone,
+            email = EXCLUDED.email, address = EXCLUDED.address
+        """,
+    ),
+    "employees": (
+        [
+            ("id", "bigint", _int),
+            ("email", "text", _text),
+            ("name", "text", _text),
+            ("role", "text", _text),
+            ("password_hash", "text", _text),
+            ("is_active", "boolean", _bool),
+        ],
+        """
+        INSERT INTO employees (id, email, name, role, password_hash, is_active)
+        SELECT DISTINCT ON (email)
+            coalesce(id, nextval(pg_get_serial_sequence('employees', 'id')::regclass)),
+            email, name, coalesce(role, 'Monteur')::role_enum, password_hash, coalesce(is_active, true)
+        FROM {staging} ORDER BY email
+        ON CONFLICT (email) DO UPDATE SET
+            name = EXCLUDED.name, role = EXCLUDED.role,
+            password_hash = coalesce(EXCLUDED.password_hash, employees.password_hash),
+            is_active = EXCLUDED.is_active
+        """,
+    ),
+    "workorders": (
+        [
+            ("id", "text", _text),
+            ("vehicle", "text", _text),
+            ("complaint", "text", _text),
+            ("status", "text", _text),
+            ("received", "date", _date),
+            ("due", "date", _date),
+            ("customer_id", "bigint", _int),
+            ("created_at", "timestamptz", _timestamp),
+        ],
+        """
+        INSERT INTO workorders (id, vehicle, complaint, status, received, due, customer_id, created_at)
+        SELECT DISTINCT ON (id) id, vehicle, complaint, coalesce(status, 'Nieuw')::workorder_status_enum,
+            received, due, customer_id, coalesce(created_at, now())
+        FROM {staging} ORDER BY id
+        ON CONFLICT (id) DO UPDATE SET
+            vehicle = EXCLUDED.vehicle, complaint = EXCLUDED.complaint, status = EXCLUDED.status,
+            received = EXCLUDED.received, due = EXCLUDED.due, customer_id = EXCLUDED.customer_id
+        """,
+    ),
+    "tasks": (
+        [
+            ("id", "bigint", _int),
+            ("workorder_id", "text", _text),
+            ("name", "text", _text),
+            ("assigned_employee_id", "bigint", _int),
+            ("status", "text", _task_status),
+            ("time_spent", "text", _text),
+            ("created_at", "timestamptz", _timestamp),
+        ],
+        """
+        INSERT INTO tasks (id, workorder_id, name, assigned_employee_id, status, time_spent, created_at)
+        SELECT DISTINCT ON (id) id, workorder_id, name, assigned_employee_id,
+            coalesce(status, 'To do')::task_status_enum, time_spent, coalesce(created_at, now())
+        FROM (
+            SELECT coalesce(id, nextval(pg_get_serial_sequence('tasks', 'id')::regclass)) AS id,
+                workorder_id, name, assigned_employee_id, status, time_spent, created_at
+            FROM {staging}
+        ) s ORDER BY id
+        ON CONFLICT (id) DO UPDATE SET
+            workorder_id = EXCLUDED.workorder_id, name = EXCLUDED.name,
+            assigned_employee_id = EXCLUDED.assigned_employee_id,
+            status = EXCLUDED.status, time_spent = EXCLUDED.time_spent
+        """,
+    ),
+}
+
+# Columns a row cannot be imported without (the upsert's conflict key)
+REQUIRED = {"employees": "email", "workorders": "id"}
+
+
+def read_rows(path: str) -> Iterator[dict]:
+    """Streams dict rows from a CSV (with header) or JSON-lines file."""
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.endswith((".jsonl", ".ndjson")):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from csv.DictReader(f)
+
+
+def batched(rows: Iterator[dict], size: int) -> Iterator[list[dict]]:
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+async def hash_passwords(pool: ProcessPoolExecutor, batch: list[dict]) -> None:
+    """Replaces plain `password` values with bcrypt hashes, spread over the process pool."""
+    loop = asyncio.get_running_loop()
+    todo = [r for r in batch if _text(r.get("password")) and not _text(r.get("password_hash"))]
+    hashes = await asyncio.gather(
+        *(loop.run_in_executor(pool, hash_password, r["password"]) for r in todo)
+    )
+    for r, h in zip(todo, hashes):
+        r["password_hash"] = h
+
+
+async def check_new_employees_have_password(
+    conn: asyncpg.Connection, path: str, records: list[tuple], names: list[str], offset: int
+) -> None:
+    """Existing employees keep their password when the file has none; new ones need one."""
+    email, password_hash = names.index("email"), names.index("password_hash")
+    missing = [(i, r[email]) for i, r in enumerate(records) if r[password_hash] is None]
+    if not missing:
+        return
+    existing = {
+        r["email"]
+        for r in await conn.fetch(
+            "SELECT email FROM employees WHERE email = ANY($1::text[])", [e for _, e in missing]
+        )
+    }
+    for i, e in missing:
+        if e not in existing:
+            raise ValueError(f"{path}: row {offset + i + 1} ({e}) is a new employee without password or password_hash")
+
+
+async def import_file(kind: str, path: str, batch_size: int, source: str, processes: int):
+    columns, upsert = SPECS[kind]
+    staging = f"import_{kind}"
+    names = [c[0] for c in columns]
+
+    conn = await asyncpg.connect(DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://"))
+    pool = ProcessPoolExecutor(max_workers=processes) if kind == "employees" else None
+    try:
+        rows = await conn.fetch("SELECT batch_no, batch_size FROM import_batches WHERE source = $1", source)
+        sizes = {r["batch_size"] for r in rows}
+        if sizes and sizes != {batch_size}:
+            # Batch numbers only identify the same rows when the batch size is the same
+            raise ValueError(
+                f"{source} was started with --batch-size {', '.join(str(n or '?') for n in sizes)}; "
+                f"re-run with that batch size or use a new --source"
+            )
+        done = {r["batch_no"] for r in rows}
+        if done:
+            print(f"↩️  Resuming {source}: {len(done)} batches already imported")
+
+        total = 0
+        started = time.monotonic()
+        for batch_no, batch in enumerate(batched(read_rows(path), batch_size)):
+            if batch_no in done:
+                total += len(batch)
+                continue
+
+            if pool:
+                await hash_passwords(pool, batch)
+            records = [tuple(conv(row.get(name)) for name, _, conv in columns) for row in batch]
+            if kind in REQUIRED:
+                key = names.index(REQUIRED[kind])
+                for i, record in enumerate(records):
+                    if record[key] is None:
+                        raise ValueError(f"{path}: row {batch_no * batch_size + i + 1} has no {REQUIRED[kind]}")
+            if kind == "employees":
+                await check_new_employees_have_password(conn, path, records, names, batch_no * batch_size)
+
+            async with conn.transaction():
+                await conn.execute(
+                    f"CREATE TEMP TABLE {staging} ("
+                    + ", ".join(f"{name} {pg_type}" for name, pg_type, _ in columns)
+                    + ") ON COMMIT DROP"
+                )
+                await conn.copy_records_to_table(staging, records=records, columns=names)
+                await conn.execute(upsert.format(staging=staging))
+                await conn.execute(
+                    "INSERT INTO import_batches (source, batch_no, batch_size, rows) VALUES ($1, $2, $3, $4)",
+                    source, batch_no, batch_size, len(batch),
+                )
+
+            total += len(batch)
+            rate = total / max(time.monotonic() - started, 1e-6)
+            print(f"  batch {batch_no}: {total} rows ({rate:.0f} rows/s)")
+
+        # Explicit ids bypass the serial sequence; move it past the imported rows.
+        # workorders have text ids and no sequence.
+        sequence = await conn.fetchval("SELECT pg_get_serial_sequence($1, 'id')", kind)
+        if sequence:
+            await conn.execute(f"SELECT setval($1::regclass, (SELECT coalesce(max(id), 1) FROM {kind}))", sequence)
+        print(f"✅ Imported {total} {kind} from {path}")
+    finally:
+        if pool:
+            pool.shutdown()
+        await conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import CSV/JSONL data")
+    parser.add_argument("kind", choices=list(SPECS))
+    parser.add_argument("path")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--source", help="checkpoint name (default: <kind>:<file name>)")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1,
+                        help="processes used for password hashing")
+    args = parser.parse_args()
+
+    source = args.source or f"{args.kind}:{os.path.basename(args.path)}"
+    asyncio.run(import_file(args.kind, args.path, args.batch_size, source, args.processes))
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n\nInterrupted; re-run the same command to resume.")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        sys.exit(1)
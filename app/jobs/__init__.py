@@ -0,0 +1,12 @@
+# app/jobs/__init__.py
+"""
+Durable background jobs stored in Postgres (see sql/001_jobs.sql).
+
+Write endpoints call `enqueue(db, kind, payload)` before committing; workers
+started from the app lifespan or `python -m app.jobs` pick the jobs up.
+"""
+from app.jobs.queue import enqueue
+from app.jobs.worker import Worker, job
+from app.jobs import handlers  # noqa: F401  (registers the handlers)
+
+__all__ = ["enqueue", "job", "Worker"]
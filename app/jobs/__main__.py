@@ -0,0 +1,31 @@
+# app/jobs/__main__.py
+"""
+Standalone job worker.
+Usage: python -m app.jobs
+
+Run this instead of (or next to) the in-app worker when background work
+should not share CPU with request handling; set JOB_WORKER_IN_APP=false on the API.
+"""
+import asyncio
+import signal
+
+from app.db import engine
+from app.jobs import Worker
+
+
+async def main():
+    worker = Worker()
+    await worker.start()
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    await stop.wait()
+    await worker.stop()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,49 @@
+# app/jobs/handlers.py
+import logging
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app import archive, sync
+from app.core import security
+from app.jobs.worker import job
+from app.models import Workorder
+
+log = logging.getLogger(__name__)
+
+
+@job("workorder_completed")
+async def notify_workorder_completed(db: AsyncSession, payload: dict) -> None:
+    q = (
+        select(Workorder)
+        .where(Workorder.id == payload["workorder_id"])
+        .options(selectinload(Workorder.customer))
+    )
+    w = (await db.execute(q)).scalar_one_or_none()
+    if not w or not w.customer:
+        log.info(f"Workorder {payload['workorder_id']} has no customer to notify")
+        return
+
+    # No mail/SMS provider is configured yet; this is where the message goes out
+    contact = w.customer.email or w.customer.phone or "no contact details"
+    log.info(f"Notify {w.customer.name} ({contact}): workorder {w.id} for {w.vehicle} is afgerond")
+
+
+@job("archive_workorders", concurrency=1)
+async def archive_workorders(db: AsyncSession, payload: dict) -> None:
+    await archive.archive_closed_workorders(db)
+    # Periodic: queue the next run
+    await archive.schedule_archiving(db, delay_seconds=archive.ARCHIVE_INTERVAL_SECONDS)
+
+
+@job("prune_tombstones", concurrency=1)
+async def prune_tombstones(db: AsyncSession, payload: dict) -> None:
+    await sync.prune_tombstones(db)
+    await sync.schedule_tombstone_pruning(db, delay_seconds=24 * 3600)
+
+
+@job("prune_refresh_tokens", concurrency=1)
+async def prune_refresh_tokens(db: AsyncSession, payload: dict) -> None:
+    await security.prune_refresh_tokens(db)
+    await security.schedule_refresh_token_pruning(db, delay_seconds=24 * 3600)
@@ -0,0 +1,109 @@
+# app/jobs/queue.py
+import os
+from datetime import timedelta
+from typing import Optional
+
+from sqlalchemy import insert, update, delete, select, exists, or_, and_, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Job, JobStatusEnum
+
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+JOB_BACKOFF_SECONDS = float(os.getenv("JOB_BACKOFF_SECONDS", "5"))
+JOB_BACKOFF_MAX_SECONDS = float(os.getenv("JOB_BACKOFF_MAX_SECONDS", "3600"))
+# A job that stays Running longer than this is assumed to belong to a dead worker
+JOB_LOCK_TIMEOUT_SECONDS = int(os.getenv("JOB_LOCK_TIMEOUT_SECONDS", "600"))
+
+
+async def enqueue(
+    db: AsyncSession,
+    kind: str,
+    payload: Optional[dict] = None,
+    *,
+    delay_seconds: float = 0,
+    max_attempts: int = JOB_MAX_ATTEMPTS,
+) -> None:
+    """
+    Adds a job to the queue. Does not commit: the job becomes visible to workers
+    together with the write that produced it, or not at all.
+    """
+    await db.execute(
+        insert(Job).values(
+            kind=kind,
+            payload=payload or {},
+            max_attempts=max_attempts,
+            run_at=func.now() + timedelta(seconds=delay_seconds),
+        )
+    )
+
+
+async def enqueue_once(
+    db: AsyncSession,
+    kind: str,
+    payload: Optional[dict] = None,
+    *,
+    delay_seconds: float = 0,
+) -> None:
+    """
+    Like `enqueue`, but skips the insert when a job of this kind is already queued.
+    Used for self-rescheduling periodic jobs, so restarts do not start a second chain.
+    """
+    # Serialises concurrent callers (e.g. several workers booting) until commit
+    await db.execute(select(func.pg_advisory_xact_lock(func.hashtext(kind))))
+    pending = await db.execute(
+        select(exists().where(Job.kind == kind, Job.status == JobStatusEnum.Queued))
+    )
+    if not pending.scalar():
+        await enqueue(db, kind, payload, delay_seconds=delay_seconds)
+
+
+async def claim_job(db: AsyncSession) -> Optional[Job]:
+    """Locks the next runnable job, marks it Running and commits straight away."""
+    stale = func.now() - timedelta(seconds=JOB_LOCK_TIMEOUT_SECONDS)
+    next_id = (
+        select(Job.id)
+        .where(
+            Job.run_at <= func.now(),
+            or_(
+                Job.status == JobStatusEnum.Queued,
+                and_(Job.status == JobStatusEnum.Running, Job.locked_at < stale),
+            ),
+        )
+        .order_by(Job.run_at, Job.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    res = await db.execute(
+        update(Job)
+        .where(Job.id == next_id)
+        .values(status=JobStatusEnum.Running, locked_at=func.now(), attempts=Job.attempts + 1)
+        .returning(Job)
+        .execution_options(synchronize_session=False)
+    )
+    job = res.scalar_one_or_none()
+    await db.commit()
+    return job
+
+
+async def complete_job(db: AsyncSession, job_id: int) -> None:
+    # Finished jobs are dropped so the queue table only holds pending and failed work
+    await db.execute(delete(Job).where(Job.id == job_id))
+    await db.commit()
+
+
+async def fail_job(db: AsyncSession, job: Job, error: str) -> None:
+    """Reschedules the job with exponential backoff, or parks it as Failed once out of attempts."""
+    if job.attempts >= job.max_attempts:
+        values = {"status": JobStatusEnum.Failed}
+    else:
+        delay = min(JOB_BACKOFF_MAX_SECONDS, JOB_BACKOFF_SECONDS * 2 ** (job.attempts - 1))
+        values = {"status": JobStatusEnum.Queued, "run_at": func.now() + timedelta(seconds=delay)}
+
+    await db.execute(
+        update(Job)
+        .where(Job.id == job.id)
+        .values(locked_at=None, last_error=error[:2000], **values)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
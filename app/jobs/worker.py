@@ -0,0 +1,98 @@
+# app/jobs/worker.py
+import asyncio
+import logging
+import os
+from typing import Awaitable, Callable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import SessionLocal
+from app.jobs.queue import claim_job, complete_job, fail_job
+
+log = logging.getLogger(__name__)
+
+JOB_CONCURRENCY = int(os.getenv("JOB_CONCURRENCY", "4"))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1.0"))
+
+HandlerFunc = Callable[[AsyncSession, dict], Awaitable[None]]
+
+
+class _Handler:
+    def __init__(self, func: HandlerFunc, concurrency: Optional[int]):
+        self.func = func
+        # Optional per-kind cap on top of the worker-wide concurrency
+        self.limit = asyncio.Semaphore(concurrency) if concurrency else None
+
+
+HANDLERS: dict[str, _Handler] = {}
+
+
+def job(kind: str, *, concurrency: Optional[int] = None):
+    """Registers an async handler `(db, payload) -> None` for a job kind."""
+    def decorator(func: HandlerFunc) -> HandlerFunc:
+        HANDLERS[kind] = _Handler(func, concurrency)
+        return func
+    return decorator
+
+
+class Worker:
+    """Runs `concurrency` polling loops that each process one job at a time."""
+
+    def __init__(self, concurrency: int = JOB_CONCURRENCY, poll_interval: float = JOB_POLL_INTERVAL):
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self._stopping = asyncio.Event()
+        self._loops: list[asyncio.Task] = []
+
+    async def start(self) -> None:
+        self._stopping.clear()
+        self._loops = [asyncio.create_task(self._loop()) for _ in range(self.concurrency)]
+        log.info(f"Job worker started with {self.concurrency} loops")
+
+    async def stop(self) -> None:
+        # Loops finish the job they are running before exiting
+        self._stopping.set()
+        await asyncio.gather(*self._loops, return_exceptions=True)
+        self._loops = []
+        log.info("Job worker stopped")
+
+    async def _loop(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                ran = await self.run_once()
+            except Exception:
+                log.exception("Job worker loop error")
+                ran = False
+
+            if not ran:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def run_once(self) -> bool:
+        """Claims and runs a single job. Returns False when the queue is empty."""
+        async with SessionLocal() as db:
+            claimed = await claim_job(db)
+        if not claimed:
+            return False
+
+        handler = HANDLERS.get(claimed.kind)
+        try:
+            if handler is None:
+                raise LookupError(f"No handler registered for job kind '{claimed.kind}'")
+            async with SessionLocal() as db:
+                if handler.limit:
+                    async with handler.limit:
+                        await handler.func(db, claimed.payload)
+                else:
+                    await handler.func(db, claimed.payload)
+        except Exception as e:
+            log.warning(f"Job {claimed.id} ({claimed.kind}) failed on attempt {claimed.attempts}: {e!r}")
+            async with SessionLocal() as db:
+                await fail_job(db, claimed, repr(e))
+            return True
+
+        async with SessionLocal() as db:
+            await complete_job(db, claimed.id)
+        return True
@@ -4,12 +4,45 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi import FastAPI, Request, Response
 from fastapi.responses import PlainTextResponse
 import traceback # <--- Add this import
+import os
+from contextlib import asynccontextmanager
 from app.routers import customers
+from app.jobs import Worker
+from app.archive import schedule_archiving
+from app.sync import WATERMARK_HEADER, schedule_tombstone_pruning
+from app.core.security import schedule_refresh_token_pruning
+from app.db import SessionLocal, engine
+from app.directory import directory
+from app.utils.compression import CompressionMiddleware
+from app.utils.profiling import PROFILE_ID_HEADER, ProfilingMiddleware
 
 # Import your routers
-from app.routers import auth, employees, portal, tasks, workorders
+from app.routers import admin, auth, employees, portal, tasks, workorders
 
-app = FastAPI(title="Your App Name", version="1.0.0")
+# Run background job workers inside the API process (disable when using `python -m app.jobs`)
+JOB_WORKER_IN_APP = os.getenv("JOB_WORKER_IN_APP", "true").lower() in ("1", "true", "yes")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    async with SessionLocal() as db:
+        await schedule_archiving(db)
+        await schedule_tombstone_pruning(db)
+        await schedule_refresh_token_pruning(db)
+
+    # Employees for auth checks and /employees, kept in memory per worker
+    await directory.start()
+
+    worker = Worker() if JOB_WORKER_IN_APP else None
+    if worker:
+        await worker.start()
+    yield
+    # Runs after the server has drained in-flight requests (SIGTERM, see app/__main__.py)
+    if worker:
+        await worker.stop()
+    await directory.stop()
+    await engine.dispose()
+
+app = FastAPI(title="Your App Name", version="1.0.0", lifespan=lifespan)
 
 @app.middleware("http")
 async def catch_exceptions_middleware(request: Request, call_next):
@@ -33,9 +66,18 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Browsers only let cross-origin clients read listed response headers
+    expose_headers=[WATERMARK_HEADER, PROFILE_ID_HEADER],
 )
 
+# Compress larger JSON responses for clients on slow connections (threshold/levels via COMPRESSION_* env)
+app.add_middleware(CompressionMiddleware)
+
+# Admin-only per-request profiling via the X-Profile header (see app/utils/profiling.py)
+app.add_middleware(ProfilingMiddleware)
+
 # Include all routers
+app.include_router(admin.router)
 app.include_router(customers.router)
 app.include_router(auth.router)
 app.include_router(employees.router)
@@ -1,7 +1,7 @@
 from sqlalchemy.orm import declarative_base, relationship
-from sqlalchemy import Column, BigInteger, Text, Enum, Date, ForeignKey, String, Boolean, TIMESTAMP, func
+from sqlalchemy import Column, BigInteger, Integer, Text, Enum, Date, ForeignKey, String, Boolean, TIMESTAMP, Index, FetchedValue, LargeBinary, func
 import enum
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy import Enum as SQLEnum
 
 Base = declarative_base()
@@ -23,6 +23,12 @@ class WorkorderStatusEnum(str, enum.Enum):
     Afgerond = "Afgerond"
 
 
+class JobStatusEnum(str, enum.Enum):
+    Queued = "Queued"
+    Running = "Running"
+    Failed = "Failed"
+
+
 class Customer(Base):
     __tablename__ = "customers"
 
@@ -32,6 +38,8 @@ class Customer(Base):
     email = Column(Text)
     address = Column(Text)
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+    # Maintained by the set_updated_at trigger (sql/005_sync.sql); drives ?since= delta sync
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), server_onupdate=FetchedValue(), nullable=False, index=True)
     
     # Relationship to access all workorders for this customer
     workorders = relationship("Workorder", back_populates="customer")
@@ -70,6 +78,7 @@ class Workorder(Base):
     customer_id = Column(BigInteger, ForeignKey("customers.id", ondelete="SET NULL"), nullable=True)
 
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), server_onupdate=FetchedValue(), nullable=False, index=True)
 
     # FIX: Creates the .customer attribute for Python access
     customer = relationship("Customer", back_populates="workorders") 
@@ -99,7 +108,115 @@ class Task(Base):
         
     time_spent = Column(Text)
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), server_onupdate=FetchedValue(), nullable=False, index=True)
     
     # Relationships
     workorder = relationship("Workorder", back_populates="tasks")
-    assigned_employee = relationship("Employee", back_populates="assigned_tasks")
\ No newline at end of file
+    assigned_employee = relationship("Employee", back_populates="assigned_tasks")
+
+class Job(Base):
+    """A unit of background work, claimed by workers with FOR UPDATE SKIP LOCKED."""
+    __tablename__ = "jobs"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    kind = Column(Text, nullable=False)
+    payload = Column(JSONB, nullable=False, server_default="{}")
+    status = Column(Enum(JobStatusEnum, name="job_status_enum"), nullable=False, server_default="Queued")
+    attempts = Column(Integer, nullable=False, server_default="0")
+    max_attempts = Column(Integer, nullable=False, server_default="5")
+    run_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+    locked_at = Column(TIMESTAMP(timezone=True))
+    last_error = Column(Text)
+    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        # Workers only ever scan runnable jobs in run_at order
+        Index("ix_jobs_runnable", "run_at", "id", postgresql_where=(status != JobStatusEnum.Failed)),
+    )
+
+
+class ImportBatch(Base):
+    """Checkpoint for `app.import_data`: one row per batch that was committed."""
+    __tablename__ = "import_batches"
+
+    source = Column(Text, primary_key=True)
+    batch_no = Column(Integer, primary_key=True)
+    batch_size = Column(Integer)  # resuming requires the same --batch-size
+    rows = Column(Integer, nullable=False)
+    imported_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+
+
+class ArchivedWorkorder(Base):
+    """Closed workorder moved out of the hot `workorders` table by app.archive."""
+    __tablename__ = "workorders_archive"
+
+    id = Column(String, primary_key=True)
+    vehicle = Column(Text, nullable=False)
+    complaint = Column(Text)
+    status = Column(Enum(WorkorderStatusEnum, name="workorder_status_enum"), nullable=False)
+    received = Column(Date)
+    due = Column(Date)
+    customer_id = Column(BigInteger, ForeignKey("customers.id", ondelete="SET NULL"), nullable=True)
+    created_at = Column(TIMESTAMP(timezone=True), nullable=False)
+    archived_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+
+    customer = relationship("Customer")
+    tasks = relationship(
+        "ArchivedTask",
+        primaryjoin="ArchivedWorkorder.id == foreign(ArchivedTask.workorder_id)",
+        viewonly=True,
+    )
+
+
+class ArchivedTask(Base):
+    __tablename__ = "tasks_archive"
+
+    id = Column(BigInteger, primary_key=True)
+    # No FK: rows are moved in the same statement as their workorder
+    workorder_id = Column(String, nullable=False, index=True)
+    assigned_employee_id = Column(BigInteger)
+    name = Column(Text, nullable=False)
+    status = Column(SQLEnum("To do", "Bezig", "Afgerond", name="task_status_enum"), nullable=False)
+    time_spent = Column(Text)
+    created_at = Column(TIMESTAMP(timezone=True), nullable=False)
+
+
+class SyncTombstone(Base):
+    """Deleted (or archived) row of a synced table, written by the record_tombstone trigger."""
+    __tablename__ = "sync_tombstones"
+
+    table_name = Column(Text, primary_key=True)
+    row_id = Column(Text, primary_key=True)
+    deleted_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_sync_tombstones_table_deleted_at", "table_name", "deleted_at"),
+    )
+
+
+class RefreshToken(Base):
+    """
+    Rotating refresh token. Only an HMAC of the token is stored; every use revokes
+    it and issues a successor in the same family, so a revoked token showing up
+    again means it was replayed and the whole family is revoked.
+    """
+    __tablename__ = "refresh_tokens"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    employee_id = Column(BigInteger, ForeignKey("employees.id", ondelete="CASCADE"), nullable=False, index=True)
+    family_id = Column(UUID, nullable=False, index=True)
+    token_hash = Column(String(64), unique=True, nullable=False)
+    expires_at = Column(TIMESTAMP(timezone=True), nullable=False, index=True)
+    revoked_at = Column(TIMESTAMP(timezone=True))
+    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+
+
+class StoredProfile(Base):
+    """A profiling report (app/utils/profiling.py), stored so any worker can serve it."""
+    __tablename__ = "profiles"
+
+    id = Column(String(12), primary_key=True)
+    kind = Column(Text, nullable=False)  # "collapsed" or "pstats"
+    label = Column(Text, nullable=False)
+    data = Column(LargeBinary, nullable=False)
+    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False, index=True)
@@ -0,0 +1,68 @@
+# app/queries.py
+"""
+Statements for the hot request paths, built once at import time.
+
+A pre-built statement with bindparam()s skips the per-request select()
+construction and memoizes its SQLAlchemy cache key, so executing it goes
+straight to the compiled-statement cache. list_tasks, whose WHERE clause
+depends on the filters given, gets one pre-built statement per filter
+combination. (lambda_stmt was measured too, but saves far less.)
+
+See `python -m app.bench_queries` for the overhead this saves.
+"""
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Select, bindparam, select
+from sqlalchemy.orm import selectinload
+
+from app.models import Employee, Task, Workorder, ArchivedWorkorder
+
+# deps.get_employee_by_email: params {"email"}
+EMPLOYEE_BY_EMAIL = select(Employee).where(Employee.email == bindparam("email"))
+
+# portal.portal_workorder: params {"workorder_id"}
+PORTAL_WORKORDER = (
+    select(Workorder)
+    .where(Workorder.id == bindparam("workorder_id"))
+    .options(selectinload(Workorder.customer), selectinload(Workorder.tasks))
+)
+PORTAL_ARCHIVED_WORKORDER = (
+    select(ArchivedWorkorder)
+    .where(ArchivedWorkorder.id == bindparam("workorder_id"))
+    .options(selectinload(ArchivedWorkorder.customer), selectinload(ArchivedWorkorder.tasks))
+)
+
+
+# list_tasks: one pre-built statement per combination of filters, built on first use
+_TASKS_SHAPES: dict[tuple[bool, bool, bool, bool], Select] = {}
+
+
+def tasks_query(
+    workorder_id: Optional[str] = None,
+    assigned_employee_id: Optional[int] = None,
+    status: Optional[str] = None,
+    since: Optional[datetime] = None,
+) -> tuple[Select, dict]:
+    """Returns (statement, params) for list_tasks; falsy filters are left out, as before."""
+    shape = (bool(workorder_id), bool(assigned_employee_id), bool(status), bool(since))
+    stmt = _TASKS_SHAPES.get(shape)
+    if stmt is None:
+        stmt = select(Task)
+        if workorder_id:
+            stmt = stmt.where(Task.workorder_id == bindparam("workorder_id"))
+        if assigned_employee_id:
+            stmt = stmt.where(Task.assigned_employee_id == bindparam("assigned_employee_id"))
+        if status:
+            stmt = stmt.where(Task.status == bindparam("status"))
+        if since:
+            stmt = stmt.where(Task.updated_at > bindparam("since"))
+        stmt = _TASKS_SHAPES[shape] = stmt.order_by(Task.created_at.desc())
+
+    params = {
+        "workorder_id": workorder_id,
+        "assigned_employee_id": assigned_employee_id,
+        "status": status,
+        "since": since,
+    }
+    return stmt, {k: v for k, v in params.items() if v}
@@ -0,0 +1,79 @@
+# app/routers/admin.py
+import asyncio
+import threading
+from datetime import datetime
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import Response, PlainTextResponse
+from pydantic import BaseModel
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import get_read_session
+from app.deps import require_admin
+from app.models import StoredProfile
+from app.utils.profiling import Profile, StackSampler, store, pstats_text
+
+# Every route here is Admin-only
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+
+
+class ProfileOut(BaseModel):
+    id: str
+    kind: str
+    label: str
+    created_at: datetime
+    size: int
+
+
+def _out(p: Profile) -> ProfileOut:
+    return ProfileOut(id=p.id, kind=p.kind, label=p.label, created_at=p.created_at, size=len(p.data))
+
+
+@router.get("/profiles", response_model=list[ProfileOut])
+async def list_profiles(db: AsyncSession = Depends(get_read_session)):
+    """Stored profiles of all workers, newest first."""
+    res = await db.execute(
+        select(
+            StoredProfile.id, StoredProfile.kind, StoredProfile.label, StoredProfile.created_at,
+            func.octet_length(StoredProfile.data).label("size"),
+        ).order_by(StoredProfile.created_at.desc())
+    )
+    return [ProfileOut(**row._mapping) for row in res]
+
+
+@router.post("/profiles/sample", response_model=ProfileOut)
+async def sample_window(seconds: float = Query(10, gt=0, le=120)):
+    """Samples this worker's event loop for `seconds` while it keeps serving requests."""
+    sampler = StackSampler(threading.get_ident())
+    sampler.start()
+    await asyncio.sleep(seconds)
+    profile = await store(Profile("collapsed", f"window {seconds:g}s", await asyncio.to_thread(sampler.stop)))
+    return _out(profile)
+
+
+@router.get("/profiles/{profile_id}")
+async def download_profile(
+    profile_id: str,
+    format: Literal["raw", "text"] = "raw",
+    db: AsyncSession = Depends(get_read_session),
+):
+    """
+    `raw`: collapsed stacks (.folded) or a pstats dump (.prof), as a download.
+    `text`: pstats profiles rendered as a table sorted by cumulative time.
+    """
+    p = await db.get(StoredProfile, profile_id)
+    await db.close()
+    if not p:
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+    if format == "text" and p.kind == "pstats":
+        return PlainTextResponse(pstats_text(p.data))
+
+    filename = f"profile-{p.id}.{'prof' if p.kind == 'pstats' else 'folded'}"
+    return Response(
+        p.data,
+        media_type="application/octet-stream" if p.kind == "pstats" else "text/plain",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
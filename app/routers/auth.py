@@ -5,9 +5,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, insert
 
 from app.db import get_session
+from app.directory import directory
 from app.models import Employee, RoleEnum
 # UPDATED IMPORTS: Removed pwd_context, added hash_password
-from app.deps import create_access_token, verify_password, hash_password, Token, AuthedUser, get_current_user
+from app.deps import create_access_token, verify_password, hash_password, get_employee_by_email, Token, AuthedUser, get_current_user
+from app.core.security import issue_refresh_token, rotate_refresh_token, revoke_token_family
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -18,6 +20,9 @@ class RegisterIn(BaseModel):
     name: constr(min_length=1) # type: ignore
     role: RoleEnum = RoleEnum.Monteur    # default
 
+class RefreshIn(BaseModel):
+    refresh_token: str
+
 @router.post("/register", response_model=Token)
 async def register_user(payload: RegisterIn, db: AsyncSession = Depends(get_session)):
     # 1) ensure email is unique
@@ -42,23 +47,49 @@ async def register_user(payload: RegisterIn, db: AsyncSession = Depends(get_sess
         .returning(Employee.id)
     )
     emp_id = (await db.execute(stmt)).scalar_one()
+    refresh = await issue_refresh_token(db, emp_id)
     await db.commit()
+    directory.invalidate()
 
     # 4) create JWT
     token = create_access_token({"sub": str(emp_id), "email": payload.email, "role": payload.role.value})
-    return {"access_token": token, "token_type": "bearer"}
+    return {"access_token": token, "token_type": "bearer", "refresh_token": refresh}
 
 # ---------- login/me unchanged ----------
 @router.post("/login", response_model=Token)
 async def login(form: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_session)):
-    res = await db.execute(select(Employee).where(Employee.email == form.username))
-    emp = res.scalar_one_or_none()
+    emp = await get_employee_by_email(db, form.username)
+    await db.close()  # release the connection before the (slow) bcrypt check
 
     if not emp or not emp.password_hash or not verify_password(form.password, emp.password_hash):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Incorrect email or password")
 
+    refresh = await issue_refresh_token(db, emp.id)
+    await db.commit()
+
+    token = create_access_token({"sub": str(emp.id), "email": emp.email, "role": emp.role.value})
+    return {"access_token": token, "token_type": "bearer", "refresh_token": refresh}
+
+@router.post("/refresh", response_model=Token)
+async def refresh(payload: RefreshIn, db: AsyncSession = Depends(get_session)):
+    """
+    Trades a refresh token for a new access token and a new refresh token.
+    No bcrypt: one indexed UPDATE ... RETURNING plus an INSERT.
+    """
+    rotated = await rotate_refresh_token(db, payload.refresh_token)
+    if not rotated:
+        raise HTTPException(status_code=401, detail="Invalid refresh token",
+                            headers={"WWW-Authenticate": "Bearer"})
+    emp, new_refresh = rotated
+
     token = create_access_token({"sub": str(emp.id), "email": emp.email, "role": emp.role.value})
-    return {"access_token": token, "token_type": "bearer"}
+    return {"access_token": token, "token_type": "bearer", "refresh_token": new_refresh}
+
+@router.post("/logout", status_code=204)
+async def logout(payload: RefreshIn, db: AsyncSession = Depends(get_session)):
+    """Revokes the refresh token and every token rotated from the same login."""
+    await revoke_token_family(db, payload.refresh_token)
+    await db.commit()
 
 @router.get("/me", response_model=AuthedUser)
 async def me(current: AuthedUser = Depends(get_current_user)):
@@ -1,27 +1,132 @@
 # app/routers/customers.py
-from fastapi import APIRouter, Depends
-from sqlalchemy import select
+import os
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from pydantic import TypeAdapter
+from sqlalchemy import func, select, or_
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Optional, Union
 
-from app.db import get_session 
+from app.db import get_read_session
 from app.models import Customer # Assuming this SQLAlchemy model exists
-from app.schemas import CustomerOut 
-from app.deps import get_current_user, AuthedUser 
+from app.schemas import CustomerOut, Delta
+from app.deps import get_current_user, AuthedUser
+from app.utils.cache import LRUCache
+from app.utils.compression import CachedPayload
+from app.sync import WATERMARK_HEADER, new_watermark, normalize_since, needs_reset, deleted_since
 
 router = APIRouter(prefix="/customers", tags=["customers"])
 
-@router.get("", response_model=List[CustomerOut])
+# Hot typeahead prefixes, per worker. Cleared by invalidate_customer_caches() on writes;
+# the TTL bounds staleness for writes made by other processes (e.g. app.import_data).
+CUSTOMER_SEARCH_CACHE_TTL = float(os.getenv("CUSTOMER_SEARCH_CACHE_TTL", "30"))
+search_cache = LRUCache(maxsize=512, ttl=CUSTOMER_SEARCH_CACHE_TTL)
+
+# Full list for the work order form, kept serialized and compressed (see CachedPayload)
+CUSTOMER_LIST_CACHE_TTL = float(os.getenv("CUSTOMER_LIST_CACHE_TTL", "30"))
+list_cache = LRUCache(maxsize=1, ttl=CUSTOMER_LIST_CACHE_TTL)
+
+# Shorter terms have no trigrams to search with; they only match the start of the name
+SEARCH_ANYWHERE_MIN_LENGTH = 3
+
+_customer_list = TypeAdapter(List[CustomerOut])
+
+
+def invalidate_customer_caches() -> None:
+    """Call after creating, updating or deleting customers."""
+    search_cache.clear()
+    list_cache.clear()
+
+
+@router.get("", response_model=Union[List[CustomerOut], Delta[CustomerOut]])
 async def list_customers(
+    request: Request,
     user: AuthedUser = Depends(get_current_user),
-    db: AsyncSession = Depends(get_session),
+    db: AsyncSession = Depends(get_read_session),
+    since: Optional[datetime] = None,
 ):
     """
     Fetches a list of all customers, ordered by name, for use in the work order form.
+    With `since`, returns a Delta of the customers changed and deleted after that watermark instead.
     """
-    # Select all customers and order them alphabetically by name
+    if since:
+        return await _customer_delta(db, normalize_since(since))
+
+    payload = list_cache.get("all")
+    if payload is None:
+        watermark = new_watermark()
+        # Select all customers and order them alphabetically by name
+        q = select(Customer).order_by(Customer.name)
+
+        res = await db.execute(q)
+        customers = res.scalars().all()
+        await db.close()
+
+        payload = CachedPayload(
+            _customer_list.dump_json([CustomerOut.model_validate(c) for c in customers]),
+            headers={WATERMARK_HEADER: watermark.isoformat()},
+        )
+        list_cache.set("all", payload)
+
+    return payload.response(request)
+
+
+async def _customer_delta(db: AsyncSession, since: datetime) -> Delta[CustomerOut]:
+    watermark = new_watermark()
+    reset = needs_reset(since)
+
     q = select(Customer).order_by(Customer.name)
-    
+    if not reset:
+        q = q.where(Customer.updated_at > since)
     res = await db.execute(q)
-    
-    return res.scalars().all()
\ No newline at end of file
+    items = [CustomerOut.model_validate(c) for c in res.scalars().all()]
+
+    deleted = [] if reset else await deleted_since(db, "customers", since, (c.id for c in items))
+    await db.close()
+    return Delta[CustomerOut](items=items, deleted=deleted, watermark=watermark, reset=reset)
+
+
+@router.get("/search", response_model=List[CustomerOut])
+async def search_customers(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(20, ge=1, le=50),
+    user: AuthedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_session),
+):
+    """
+    Typeahead for the work order form: matches name (anywhere, from 3 characters; before that
+    the start of the name) and phone/email (prefix), names starting with the query first.
+    Backed by the indexes in sql/003_customer_search.sql.
+    """
+    term = q.strip().lower()
+    if not term:
+        raise HTTPException(status_code=400, detail="q must not be blank")
+    key = (term, limit)
+    cached = search_cache.get(key)
+    if cached is not None:
+        return cached
+
+    name_prefix = func.lower(Customer.name).startswith(term, autoescape=True)
+    if len(term) >= SEARCH_ANYWHERE_MIN_LENGTH:
+        name_match = Customer.name.icontains(term, autoescape=True)  # trigram GIN index
+    else:
+        name_match = name_prefix  # lower(name) text_pattern_ops btree index
+    stmt = (
+        select(Customer)
+        .where(
+            or_(
+                name_match,
+                Customer.phone.istartswith(term, autoescape=True),
+                Customer.email.istartswith(term, autoescape=True),
+            )
+        )
+        .order_by(name_prefix.desc(), Customer.name)
+        .limit(limit)
+    )
+    res = await db.execute(stmt)
+    customers = res.scalars().all()
+    await db.close()
+
+    out = [CustomerOut.model_validate(c) for c in customers]
+    search_cache.set(key, out)
+    return out
@@ -1,24 +1,23 @@
 # app/routers/employees.py
-from fastapi import APIRouter, Depends
-from sqlalchemy import select, insert, update
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import insert, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.db import get_session
+from app.directory import directory
 from app.models import Employee
-from app.schemas import EmployeeCreate, EmployeeOut
+from app.schemas import EmployeeCreate, EmployeeOut, EmployeeUpdate
 from app.deps import get_current_user, require_admin, AuthedUser
 
 
 router = APIRouter(prefix="/employees", tags=["employees"])
 
 @router.get("", response_model=list[EmployeeOut])
-async def list_employees(
-    user: AuthedUser = Depends(get_current_user),
-    db: AsyncSession = Depends(get_session)
-):
-    res = await db.execute(select(Employee).order_by(Employee.id.desc()))
+async def list_employees(user: AuthedUser = Depends(get_current_user)):
+    # Served from the in-process directory, no DB round trip
+    employees = await directory.all()
     return [
         EmployeeOut(id=e.id, name=e.name, role=e.role.value, user_id=e.user_id)
-        for e in res.scalars().all()
+        for e in employees
     ]
 
 @router.post("", response_model=EmployeeOut, status_code=201)
@@ -35,22 +34,31 @@ async def create_employee(
     )
     res = await db.execute(stmt)
     await db.commit()
+    directory.invalidate()
     e = res.scalar_one()
     return EmployeeOut(id=e.id, name=e.name, role=e.role.value, user_id=e.user_id)
 
 @router.patch("/{employee_id}", response_model=EmployeeOut)
 async def update_employee(
     employee_id: int,
-    payload: EmployeeCreate,
+    payload: EmployeeUpdate,
     user: AuthedUser = Depends(get_current_user),  # keep as-is; make admin-only if you want
     db: AsyncSession = Depends(get_session)
 ):
+    # Only the fields sent are updated
+    values = payload.model_dump(exclude_unset=True)
+    if not values:
+        raise HTTPException(status_code=400, detail="No fields to update")
+
     res = await db.execute(
         update(Employee)
         .where(Employee.id == employee_id)
-        .values(name=payload.name, role=payload.role, user_id=payload.user_id)
+        .values(**values)
         .returning(Employee)
     )
     await db.commit()
-    e = res.scalar_one()
+    directory.invalidate()
+    e = res.scalar_one_or_none()
+    if not e:
+        raise HTTPException(status_code=404, detail="Not found")
     return EmployeeOut(id=e.id, name=e.name, role=e.role.value, user_id=e.user_id)
@@ -1,15 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
+import os
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload # <-- IMPORT selectinload
 
-from app.db import get_session
-from app.models import Workorder, Task # Task is only needed for the calculation logic
+from app.db import get_read_session
+from app.queries import PORTAL_WORKORDER, PORTAL_ARCHIVED_WORKORDER
+from app.utils.cache import LRUCache
+from app.utils.compression import CachedPayload
 from pydantic import BaseModel
 from typing import Optional
 
 router = APIRouter(prefix="/portal", tags=["portal"])
 
+# Public and polled by customers; cached per workorder, per worker
+PORTAL_CACHE_TTL = float(os.getenv("PORTAL_CACHE_TTL", "10"))
+portal_cache = LRUCache(maxsize=1024, ttl=PORTAL_CACHE_TTL)
+
+
+def invalidate_portal(workorder_id: str) -> None:
+    """Call after a workorder or one of its tasks changes."""
+    portal_cache.invalidate(workorder_id)
+
 # (PortalTask and PortalWO classes remain the same)
 class PortalTask(BaseModel):
     name: str
@@ -26,21 +36,20 @@ class PortalWO(BaseModel):
 # ----------------------------------------------------------------------
 
 @router.get("/{workorder_id}", response_model=PortalWO)
-async def portal_workorder(workorder_id: str, db: AsyncSession = Depends(get_session)):
-    
-    # 1. Eager-Load Customer and Tasks to prevent MissingGreenlet error
-    q = (
-        select(Workorder)
-        .where(Workorder.id == workorder_id)
-        .options(
-            selectinload(Workorder.customer), # Load the related Customer data now
-            selectinload(Workorder.tasks)     # Load the related Tasks data now
-        )
-    )
-    
-    # Execute the single, optimized query
-    w = (await db.execute(q)).scalar_one_or_none()
-    
+async def portal_workorder(workorder_id: str, request: Request, db: AsyncSession = Depends(get_read_session)):
+    cached = portal_cache.get(workorder_id)
+    if cached is not None:
+        return cached.response(request)
+
+    # 1. Eager-Load Customer and Tasks to prevent MissingGreenlet error (pre-built, see app/queries.py)
+    params = {"workorder_id": workorder_id}
+    w = (await db.execute(PORTAL_WORKORDER, params)).scalar_one_or_none()
+
+    # Closed workorders may have been moved to the archive (see app/archive.py)
+    if not w:
+        w = (await db.execute(PORTAL_ARCHIVED_WORKORDER, params)).scalar_one_or_none()
+    await db.close()
+
     if not w:
         raise HTTPException(404, "Not found")
 
@@ -52,8 +61,8 @@ async def portal_workorder(workorder_id: str, db: AsyncSession = Depends(get_ses
     done = len([t for t in ts if t.status == "Afgerond"]) 
     progress = round(done / total * 100)
     
-    # 3. Return the result
-    return PortalWO(
+    # 3. Cache and return the result
+    out = PortalWO(
         id=w.id, 
         vehicle=w.vehicle, 
         # FIX: Access the customer's name attribute for the PortalWO string field
@@ -62,4 +71,7 @@ async def portal_workorder(workorder_id: str, db: AsyncSession = Depends(get_ses
         status=w.status, 
         progress_pct=progress,
         tasks=[PortalTask(name=t.name, status=t.status) for t in ts]
-    )
\ No newline at end of file
+    )
+    payload = CachedPayload(out.model_dump_json().encode())
+    portal_cache.set(workorder_id, payload)
+    return payload.response(request)
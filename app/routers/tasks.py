@@ -1,34 +1,49 @@
 # app/routers/tasks.py
-from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select, insert, update
+from datetime import datetime
+from typing import Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy import insert, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db import get_session
+from app.db import get_session, get_read_session
 from app.models import Task, TaskStatusEnum
-from app.schemas import TaskCreate, TaskOut
+from app.queries import tasks_query
+from app.schemas import TaskCreate, TaskOut, TaskUpdate, TaskStatusUpdate, Delta
 from app.deps import get_current_user, AuthedUser
+from app.routers.portal import invalidate_portal
+from app.sync import WATERMARK_HEADER, new_watermark, normalize_since, needs_reset, deleted_since, left_filter_since
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
-@router.get("", response_model=list[TaskOut])
+@router.get("", response_model=Union[list[TaskOut], Delta[TaskOut]])
 async def list_tasks(
+    response: Response,
     user: AuthedUser = Depends(get_current_user),
-    db: AsyncSession = Depends(get_session),
+    db: AsyncSession = Depends(get_read_session),
     workorder_id: Optional[str] = None,
     assigned_employee_id: Optional[int] = None,
     status: Optional[str] = None,
+    since: Optional[datetime] = None,
 ):
-    q = select(Task)
-    if workorder_id:
-        q = q.where(Task.workorder_id == workorder_id)
-    if assigned_employee_id:
-        q = q.where(Task.assigned_employee_id == assigned_employee_id)
-    if status:
-        q = q.where(Task.status == status)
+    """
+    Without `since`: the full (filtered) list, with the sync watermark in the X-Sync-Watermark header.
+    With `since`: a Delta of the tasks changed and deleted after that watermark.
+    """
+    watermark = new_watermark()
+    since = normalize_since(since) if since else None
+    reset = bool(since) and needs_reset(since)
 
-    res = await db.execute(q.order_by(Task.created_at.desc()))
+    q, params = tasks_query(workorder_id, assigned_employee_id, status, since if not reset else None)
+    res = await db.execute(q, params)
     tasks = res.scalars().all()
-    return [
+
+    deleted = []
+    if since and not reset:
+        deleted = await deleted_since(db, "tasks", since, (t.id for t in tasks))
+        if workorder_id or assigned_employee_id or status:
+            deleted += await left_filter_since(db, Task, since, (t.id for t in tasks))
+    await db.close()
+
+    items = [
         TaskOut(
             id=t.id,
             workorder_id=t.workorder_id,
@@ -40,6 +55,12 @@ async def list_tasks(
         for t in tasks
     ]
 
+    if not since:
+        response.headers[WATERMARK_HEADER] = watermark.isoformat()
+        return items
+
+    return Delta[TaskOut](items=items, deleted=deleted, watermark=watermark, reset=reset)
+
 @router.post("", response_model=TaskOut, status_code=201)
 async def create_task(
     payload: TaskCreate,
@@ -73,6 +94,7 @@ async def create_task(
     res = await db.execute(stmt)
     await db.commit()
     t = res.scalar_one()
+    invalidate_portal(t.workorder_id)
     
     print(f"✅ Task created with ID {t.id}, status: {t.status}")
     
@@ -85,43 +107,25 @@ async def create_task(
         time_spent=t.time_spent,
     )
 
-@router.patch("/{task_id}", response_model=TaskOut)
-async def update_task(
-    task_id: int,
-    payload: TaskCreate,
-    user: AuthedUser = Depends(get_current_user),
-    db: AsyncSession = Depends(get_session),
-):
-    # 🌟 CRITICAL FIX: Use the enum directly
-    if payload.status == "ToDo" or payload.status == "To do":
-        status_enum = TaskStatusEnum.ToDo
-    elif payload.status == "Bezig":
-        status_enum = TaskStatusEnum.Bezig
-    elif payload.status == "Afgerond":
-        status_enum = TaskStatusEnum.Afgerond
-    else:
-        status_enum = TaskStatusEnum.ToDo
-    
-    print(f"🔍 Updating task {task_id} - Input: '{payload.status}' -> Enum: {status_enum} -> Value: '{status_enum.value}'")
-    
+async def _apply_task_update(db: AsyncSession, task_id: int, values: dict) -> TaskOut:
+    """Writes only the given columns in a single UPDATE ... RETURNING."""
+    if "status" in values:
+        # 🌟 Use the enum directly, not the string
+        values["status"] = TaskStatusEnum(values["status"])
+
     res = await db.execute(
         update(Task)
         .where(Task.id == task_id)
-        .values(
-            workorder_id=payload.workorder_id,
-            name=payload.name,
-            assigned_employee_id=payload.assigned_employee_id,
-            status=status_enum,  # Use the enum!
-            time_spent=payload.time_spent
-        )
+        .values(**values)
         .returning(Task)
     )
     await db.commit()
     t = res.scalar_one_or_none()
     if not t:
         raise HTTPException(status_code=404, detail="Not found")
+    invalidate_portal(t.workorder_id)
 
-    print(f"✅ Task {task_id} updated, status: {t.status}")
+    print(f"✅ Task {task_id} updated ({', '.join(values)}), status: {t.status}")
 
     return TaskOut(
         id=t.id,
@@ -130,4 +134,27 @@ async def update_task(
         assigned_employee_id=t.assigned_employee_id,
         status=t.status,
         time_spent=t.time_spent,
-    )
\ No newline at end of file
+    )
+
+@router.patch("/{task_id}", response_model=TaskOut)
+async def update_task(
+    task_id: int,
+    payload: TaskUpdate,
+    user: AuthedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_session),
+):
+    # Only the fields sent are updated; an omitted status is left alone
+    values = payload.model_dump(exclude_unset=True)
+    if not values:
+        raise HTTPException(status_code=400, detail="No fields to update")
+    return await _apply_task_update(db, task_id, values)
+
+@router.patch("/{task_id}/status", response_model=TaskOut)
+async def update_task_status(
+    task_id: int,
+    payload: TaskStatusUpdate,
+    user: AuthedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_session),
+):
+    """Status tap from the workshop: one small request, one UPDATE."""
+    return await _apply_task_update(db, task_id, {"status": payload.status})
@@ -1,32 +1,67 @@
 # app/routers/workorders.py
-from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select, insert, update
+from datetime import datetime
+from typing import Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy import select, insert, update, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload # 🌟 Imported for eager loading
 import uuid # 🌟 ADD THIS IMPORT 🌟
 
-from app.db import get_session
-from app.models import Workorder
-from app.schemas import WorkorderCreate, WorkorderOut
+from app.db import get_session, get_read_session
+from app.models import Customer, Workorder, ArchivedWorkorder, WorkorderStatusEnum
+from app.schemas import WorkorderCreate, WorkorderOut, WorkorderStatusUpdate, WorkorderStatusOut, Delta
 from app.deps import get_current_user, AuthedUser
+from app.jobs import enqueue
+from app.routers.portal import invalidate_portal
+from app.sync import WATERMARK_HEADER, new_watermark, normalize_since, needs_reset, deleted_since, left_filter_since
 
 
 router = APIRouter(prefix="/workorders", tags=["workorders"])
 
 
+async def _new_workorder_id(db: AsyncSession) -> str:
+    """A short id that is not in use, in the hot table or in the archive."""
+    while True:
+        candidate = str(uuid.uuid4())[:8]
+        taken = await db.execute(
+            select(Workorder.id).where(Workorder.id == candidate)
+            .union_all(select(ArchivedWorkorder.id).where(ArchivedWorkorder.id == candidate))
+        )
+        if taken.first() is None:
+            return candidate
+
+
+async def _lock_status(db: AsyncSession, workorder_id: str) -> Optional[WorkorderStatusEnum]:
+    """
+    Current status, with the row locked until commit. Concurrent updates queue behind
+    the lock and then see the committed status, so only a real change into Afgerond notifies.
+    """
+    res = await db.execute(select(Workorder.status).where(Workorder.id == workorder_id).with_for_update())
+    return res.scalar_one_or_none()
+
+
 import logging
 # Add this line at the top of the file
 log = logging.getLogger(__name__)
 
-@router.get("", response_model=list[WorkorderOut])
+@router.get("", response_model=Union[list[WorkorderOut], Delta[WorkorderOut]])
 async def list_workorders(
+    response: Response,
     user: AuthedUser = Depends(get_current_user),
-    db: AsyncSession = Depends(get_session),
+    db: AsyncSession = Depends(get_read_session),
     status: Optional[str] = None,
+    since: Optional[datetime] = None,
 ):
+    """
+    Without `since`: the full list, with the sync watermark in the X-Sync-Watermark header.
+    With `since`: a Delta of the workorders changed and deleted/archived after that watermark.
+    """
     # This log MUST appear if authentication succeeded
     log.info(f"Starting list_workorders request. Status filter: {status}") 
+
+    watermark = new_watermark()
+    since = normalize_since(since) if since else None
+    reset = bool(since) and needs_reset(since)
     
     q = (
         select(Workorder)
@@ -36,9 +71,20 @@ async def list_workorders(
     
     if status:
         q = q.where(Workorder.status == status)
+    if since and not reset:
+        # Items embed the customer's name and phone, so a customer edit changes them too
+        changed_customers = select(Customer.id).where(Customer.updated_at > since)
+        q = q.where(or_(Workorder.updated_at > since, Workorder.customer_id.in_(changed_customers)))
 
     res = await db.execute(q)
     workorders = res.scalars().unique().all()
+
+    deleted = []
+    if since and not reset:
+        deleted = await deleted_since(db, "workorders", since, (w.id for w in workorders))
+        if status:
+            deleted += await left_filter_since(db, Workorder, since, (w.id for w in workorders))
+    await db.close()
     
     log.info(f"Successfully fetched {len(workorders)} workorders from the database.")
     
@@ -65,8 +111,12 @@ async def list_workorders(
         )
         
     log.info("Successfully created dictionary list. Returning to FastAPI.")
-    
-    return output
+
+    if not since:
+        response.headers[WATERMARK_HEADER] = watermark.isoformat()
+        return output
+
+    return Delta[WorkorderOut](items=output, deleted=deleted, watermark=watermark, reset=reset)
 
 
 
@@ -77,7 +127,7 @@ async def create_workorder(
     db: AsyncSession = Depends(get_session),
 ):
 
-    generated_id = str(uuid.uuid4())[:8] # Generate a short, unique ID string
+    generated_id = await _new_workorder_id(db) # Generate a short, unique ID string
 
     insert_data = payload.model_dump()
     insert_data['id'] = generated_id # Add the generated ID to the insert data
@@ -130,18 +180,27 @@ async def update_workorder(
     user: AuthedUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_session),
 ):
+    # Clients send the full form on every PATCH; only notify when the status changes to Afgerond
+    completing = "status" in payload.model_fields_set and payload.status == WorkorderStatusEnum.Afgerond.value
+    old_status = await _lock_status(db, workorder_id) if completing else None
+
     res = await db.execute(
         update(Workorder)
         .where(Workorder.id == workorder_id)
         .values(**payload.model_dump(exclude_unset=True)) # Use exclude_unset for PATCH
         .returning(Workorder)
     )
-    await db.commit()
     w = res.scalar_one_or_none()
 
     if not w:
         raise HTTPException(status_code=404, detail="Work order not found")
 
+    # Customer notification runs in the background, committed together with the status change
+    if completing and old_status != WorkorderStatusEnum.Afgerond:
+        await enqueue(db, "workorder_completed", {"workorder_id": w.id})
+    await db.commit()
+    invalidate_portal(w.id)
+
     # 🌟 FIX: Manually refresh the relationship after commit for the return object
     # Use selectinload to ensure 'customer' is loaded before serialization
     await db.execute(select(Workorder).where(Workorder.id == w.id).options(selectinload(Workorder.customer)))
@@ -156,4 +215,31 @@ async def update_workorder(
         due=w.due,
         complaint=w.complaint,
         status=w.status.value,
-    )
\ No newline at end of file
+    )
+
+@router.patch("/{workorder_id}/status", response_model=WorkorderStatusOut)
+async def update_workorder_status(
+    workorder_id: str,
+    payload: WorkorderStatusUpdate,
+    user: AuthedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_session),
+):
+    """Changes only the status, without re-reading the workorder and its customer."""
+    old_status = await _lock_status(db, workorder_id)
+    res = await db.execute(
+        update(Workorder)
+        .where(Workorder.id == workorder_id)
+        .values(status=WorkorderStatusEnum(payload.status))
+        .returning(Workorder.id, Workorder.status)
+    )
+    row = res.one_or_none()
+    if not row:
+        raise HTTPException(status_code=404, detail="Work order not found")
+
+    # A double tap or a client retry must not notify the customer twice
+    if payload.status == WorkorderStatusEnum.Afgerond.value and old_status != WorkorderStatusEnum.Afgerond:
+        await enqueue(db, "workorder_completed", {"workorder_id": row.id})
+    await db.commit()
+    invalidate_portal(row.id)
+
+    return WorkorderStatusOut(id=row.id, status=row.status.value)
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, field_validator
-from typing import Optional, Literal
-from datetime import date
+from typing import Generic, Optional, Literal, TypeVar
+from datetime import date, datetime
 
 class EmployeeCreate(BaseModel):
     name: str
@@ -10,6 +10,19 @@ class EmployeeCreate(BaseModel):
 class EmployeeOut(EmployeeCreate):
     id: int
 
+# --- Partial updates: only the fields present in the body are written (exclude_unset) ---
+class EmployeeUpdate(BaseModel):
+    name: Optional[str] = None
+    role: Optional[Literal["Admin","Balie","Monteur"]] = None
+    user_id: Optional[str] = None
+
+    @field_validator('name', 'role')
+    @classmethod
+    def not_null(cls, v):
+        if v is None:
+            raise ValueError("may not be null")
+        return v
+
 # --- WorkorderCreate (The INPUT model for POST requests) ---
 class WorkorderCreate(BaseModel):
     vehicle: str
@@ -30,6 +43,13 @@ class WorkorderOut(BaseModel):
     customer: str  # Customer Name
     phone: Optional[str] = None # Customer Phone
 
+# --- PATCH /workorders/{id}/status ---
+class WorkorderStatusUpdate(BaseModel):
+    status: Literal["Nieuw","In behandeling","Afgerond"]
+
+class WorkorderStatusOut(WorkorderStatusUpdate):
+    id: str
+
 class TaskCreate(BaseModel):
     workorder_id: str
     name: str
@@ -58,6 +78,31 @@ class TaskCreate(BaseModel):
 class TaskOut(TaskCreate):
     id: int
 
+def _task_status(v):
+    # Same mapping as TaskCreate.normalize_status, but unknown values are rejected
+    return "To do" if v == "ToDo" else v
+
+class TaskUpdate(BaseModel):
+    workorder_id: Optional[str] = None
+    name: Optional[str] = None
+    assigned_employee_id: Optional[int] = None
+    status: Optional[Literal["To do","Bezig","Afgerond"]] = None
+    time_spent: Optional[str] = None
+
+    _normalize_status = field_validator('status', mode='before')(_task_status)
+
+    @field_validator('workorder_id', 'name', 'status')
+    @classmethod
+    def not_null(cls, v):
+        if v is None:
+            raise ValueError("may not be null")
+        return v
+
+class TaskStatusUpdate(BaseModel):
+    status: Literal["To do","Bezig","Afgerond"]
+
+    _normalize_status = field_validator('status', mode='before')(_task_status)
+
 class CustomerOut(BaseModel):
     id: int
     name: str 
@@ -65,4 +110,13 @@ class CustomerOut(BaseModel):
     email: Optional[str] = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+T = TypeVar("T")
+
+class Delta(BaseModel, Generic[T]):
+    """Response of a list endpoint called with ?since=<watermark>."""
+    items: list[T]           # rows created or changed after `since`
+    deleted: list[str] = []  # ids removed (deleted or archived) after `since`
+    watermark: datetime      # pass as `since` on the next sync
+    reset: bool = False      # `since` was too old: items is the full list, replace local data
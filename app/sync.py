@@ -0,0 +1,75 @@
+# app/sync.py
+"""
+Helpers for `?since=` delta sync on the list endpoints.
+
+Rows carry a trigger-maintained `updated_at`; deletions (including archiving)
+leave a row in `sync_tombstones`. A client stores the returned watermark and
+passes it as `since` next time to get only what changed.
+"""
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Iterable
+
+from sqlalchemy import select, delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.jobs.queue import enqueue_once
+from app.models import SyncTombstone
+
+WATERMARK_HEADER = "X-Sync-Watermark"
+
+# The watermark trails the read by this much, so rows from transactions that were
+# still open during the read are sent again next time instead of being missed.
+SYNC_LAG_SECONDS = int(os.getenv("SYNC_LAG_SECONDS", "30"))
+TOMBSTONE_RETENTION_DAYS = int(os.getenv("TOMBSTONE_RETENTION_DAYS", "30"))
+
+
+def new_watermark() -> datetime:
+    """Take this before running the query it belongs to."""
+    return datetime.now(timezone.utc) - timedelta(seconds=SYNC_LAG_SECONDS)
+
+
+def normalize_since(since: datetime) -> datetime:
+    # Naive timestamps from clients are taken as UTC
+    return since if since.tzinfo else since.replace(tzinfo=timezone.utc)
+
+
+def needs_reset(since: datetime) -> bool:
+    """True when tombstones from before `since` may already be pruned, so a delta would be incomplete."""
+    return since < datetime.now(timezone.utc) - timedelta(days=TOMBSTONE_RETENTION_DAYS)
+
+
+async def deleted_since(db: AsyncSession, table: str, since: datetime, present_ids: Iterable = ()) -> list[str]:
+    """Ids deleted from `table` after `since`, minus ids that were re-inserted and are being returned."""
+    res = await db.execute(
+        select(SyncTombstone.row_id).where(
+            SyncTombstone.table_name == table, SyncTombstone.deleted_at > since
+        )
+    )
+    present = {str(i) for i in present_ids}
+    return [row_id for row_id in res.scalars().all() if row_id not in present]
+
+
+async def left_filter_since(db: AsyncSession, model, since: datetime, present_ids: Iterable = ()) -> list[str]:
+    """
+    Ids of `model` rows changed after `since` that a filtered delta did not return: they
+    no longer match the filter (reassigned, status changed), so the client should drop them.
+    May include rows the client never had; removing an unknown id is a no-op.
+    """
+    res = await db.execute(select(model.id).where(model.updated_at > since))
+    present = {str(i) for i in present_ids}
+    return [str(i) for i in res.scalars().all() if str(i) not in present]
+
+
+async def prune_tombstones(db: AsyncSession) -> None:
+    await db.execute(
+        delete(SyncTombstone).where(
+            SyncTombstone.deleted_at < func.now() - timedelta(days=TOMBSTONE_RETENTION_DAYS)
+        )
+    )
+    await db.commit()
+
+
+async def schedule_tombstone_pruning(db: AsyncSession, delay_seconds: float = 0) -> None:
+    await enqueue_once(db, "prune_tombstones", delay_seconds=delay_seconds)
+    await db.commit()
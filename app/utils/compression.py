@@ -0,0 +1,201 @@
+# app/utils/compression.py
+"""
+Negotiated response compression (zstd, brotli, gzip).
+
+`CompressionMiddleware` compresses responses above a size threshold, including
+streaming responses. `CachedPayload` holds a serialized body together with its
+compressed variants, so cached endpoints compress once instead of per request.
+brotli and zstandard are optional; without them only gzip is offered.
+"""
+import os
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_LEVELS = {
+    "gzip": int(os.getenv("COMPRESSION_GZIP_LEVEL", "6")),
+    "br": int(os.getenv("COMPRESSION_BROTLI_LEVEL", "4")),
+    "zstd": int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3")),
+}
+
+# Server preference when the client accepts several with the same q-value
+SUPPORTED = [e for e, available in (("zstd", zstandard), ("br", brotli), ("gzip", zlib)) if available]
+
+_COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript", "application/xml")
+
+
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """Picks the best supported encoding from an Accept-Encoding header, or None."""
+    accepted: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            accepted[name.strip().lower()] = q
+
+    best, best_q = None, 0.0
+    for enc in SUPPORTED:
+        q = accepted.get(enc, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = enc, q
+    return best
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    level = COMPRESSION_LEVELS[encoding]
+    if encoding == "br":
+        return brotli.compress(data, quality=level)
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=level).compress(data)
+    c = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits=31: gzip container
+    return c.compress(data) + c.flush()
+
+
+class _StreamCompressor:
+    """Incremental compressor that flushes after every chunk so streamed data is not held back."""
+
+    def __init__(self, encoding: str):
+        level = COMPRESSION_LEVELS[encoding]
+        self.encoding = encoding
+        if encoding == "br":
+            self._c = brotli.Compressor(quality=level)
+        elif encoding == "zstd":
+            self._c = zstandard.ZstdCompressor(level=level).compressobj()
+        else:
+            self._c = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def chunk(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._c.process(data) + self._c.flush()
+        if self.encoding == "zstd":
+            return self._c.compress(data) + self._c.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+        return self._c.compress(data) + self._c.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._c.finish()
+        return self._c.flush()
+
+
+def _compressible(headers: Headers) -> bool:
+    if "content-encoding" in headers:
+        return False
+    content_type = headers.get("content-type", "")
+    return content_type.startswith(_COMPRESSIBLE_TYPES) and not content_type.startswith("text/event-stream")
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if not encoding:
+            await self.app(scope, receive, send)
+            return
+
+        await _Responder(self.app, encoding, self.minimum_size)(scope, receive, send)
+
+
+class _Responder:
+    def __init__(self, app: ASGIApp, encoding: str, minimum_size: int):
+        self.app = app
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.send: Send = None
+        self.start: Optional[Message] = None
+        self.passthrough = False
+        self.stream: Optional[_StreamCompressor] = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_wrapper)
+
+    async def send_wrapper(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Held back until the first body chunk shows whether to compress
+            self.start = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.stream:
+            data = self.stream.chunk(body) if more_body else self.stream.chunk(body) + self.stream.finish()
+            await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
+            return
+
+        headers = MutableHeaders(raw=self.start["headers"])
+        if not _compressible(headers) or (not more_body and len(body) < self.minimum_size):
+            self.passthrough = True
+            await self.send(self.start)
+            await self.send(message)
+            return
+
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if not more_body:
+            body = compress(body, self.encoding)
+            headers["Content-Length"] = str(len(body))
+            await self.send(self.start)
+            await self.send({"type": "http.response.body", "body": body})
+            return
+
+        # Streaming response: total size is unknown, compress chunk by chunk
+        del headers["Content-Length"]
+        self.stream = _StreamCompressor(self.encoding)
+        await self.send(self.start)
+        await self.send({"type": "http.response.body", "body": self.stream.chunk(body), "more_body": True})
+
+
+class CachedPayload:
+    """A serialized response body plus its compressed variants, built lazily per encoding."""
+
+    def __init__(self, body: bytes, media_type: str = "application/json", headers: Optional[dict] = None):
+        self.body = body
+        self.media_type = media_type
+        self.headers = headers or {}
+        self._variants: dict[str, bytes] = {}
+
+    def response(self, request: Request) -> Response:
+        encoding = negotiate(request.headers.get("accept-encoding", ""))
+        if not encoding or len(self.body) < COMPRESSION_MIN_SIZE:
+            return Response(self.body, media_type=self.media_type, headers={**self.headers, "Vary": "Accept-Encoding"})
+
+        data = self._variants.get(encoding)
+        if data is None:
+            data = self._variants[encoding] = compress(self.body, encoding)
+        return Response(
+            data,
+            media_type=self.media_type,
+            headers={**self.headers, "Content-Encoding": encoding, "Vary": "Accept-Encoding"},
+        )
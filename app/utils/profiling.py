@@ -0,0 +1,209 @@
+# app/utils/profiling.py
+"""
+On-demand profiling for live diagnosis.
+
+- Single request: send `X-Profile: 1` (sampled stacks) or `X-Profile: cprofile`
+  together with an Admin bearer token. The response carries `X-Profile-Id`;
+  download the report from `/admin/profiles/{id}`.
+- Time window: `POST /admin/profiles/sample?seconds=N` samples whatever the
+  worker that receives it runs during that window.
+
+Reports are stored in the `profiles` table (sql/008_profiles.sql), so the
+download works whichever worker serves it.
+
+Sampled reports are in collapsed-stack format (flamegraph.pl, inferno, speedscope);
+cProfile reports are pstats files (snakeviz, flameprof) or text. Only one cProfile
+can run per process; a cprofile request overlapping another one is sampled instead.
+Requests without the header only pay for one header lookup.
+
+Both modes observe the whole event loop thread, so other requests running
+concurrently in the same worker show up as well. Time spent awaiting the
+database is not on the CPU and does not appear in sampled stacks.
+"""
+import cProfile
+import io
+import logging
+import marshal
+import os
+import pstats
+import sys
+import threading
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Optional
+
+from jose import jwt, JWTError
+from sqlalchemy import delete, insert, select
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.db import SessionLocal, ReadSessionLocal
+from app.deps import SECRET_KEY, ALGORITHM, load_active_employee
+from app.models import RoleEnum, StoredProfile
+
+log = logging.getLogger(__name__)
+
+PROFILE_ID_HEADER = "X-Profile-Id"
+PROFILE_SAMPLE_INTERVAL = float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "2")) / 1000
+PROFILES_KEPT = int(os.getenv("PROFILES_KEPT", "20"))
+
+# Only one cProfile.Profile can be enabled per process (3.12+ raises, older versions
+# silently hand over the hook); overlapping cprofile requests are sampled instead
+_cprofile_running = False
+
+
+class Profile:
+    def __init__(self, kind: str, label: str, data: bytes):
+        self.id = uuid.uuid4().hex[:12]
+        self.kind = kind  # "collapsed" or "pstats"
+        self.label = label
+        self.data = data
+        self.created_at = datetime.now(timezone.utc)
+
+
+async def store(profile: Profile) -> Profile:
+    """Saves a report for all workers to serve and drops the oldest beyond PROFILES_KEPT."""
+    async with SessionLocal() as db:
+        await db.execute(
+            insert(StoredProfile).values(
+                id=profile.id, kind=profile.kind, label=profile.label,
+                data=profile.data, created_at=profile.created_at,
+            )
+        )
+        newest = select(StoredProfile.id).order_by(StoredProfile.created_at.desc()).limit(PROFILES_KEPT)
+        await db.execute(delete(StoredProfile).where(StoredProfile.id.not_in(newest)))
+        await db.commit()
+    return profile
+
+
+class StackSampler:
+    """Samples one thread's Python stack from a background thread and counts collapsed stacks."""
+
+    def __init__(self, thread_id: int, interval: float = PROFILE_SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> bytes:
+        self._done.set()
+        self._thread.join()
+        return "\n".join(f"{stack} {n}" for stack, n in self.stacks.most_common()).encode()
+
+    def _run(self) -> None:
+        while not self._done.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{os.path.basename(code.co_filename)}:{getattr(code, 'co_qualname', code.co_name)}")
+                frame = frame.f_back
+            if names:
+                self.stacks[";".join(reversed(names))] += 1
+
+
+def pstats_text(data: bytes, limit: int = 60) -> str:
+    """Renders a stored pstats dump sorted by cumulative time."""
+    out = io.StringIO()
+    stats = pstats.Stats(_StatsSource(marshal.loads(data)), stream=out)
+    stats.sort_stats("cumulative").print_stats(limit)
+    return out.getvalue()
+
+
+class _StatsSource:
+    # pstats.Stats accepts any object with create_stats()/stats
+    def __init__(self, stats: dict):
+        self.stats = stats
+
+    def create_stats(self) -> None:
+        pass
+
+
+async def _is_admin(scope: Scope) -> bool:
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme != "Bearer":
+                return False
+            try:
+                claims = jwt.decode(token.strip(), SECRET_KEY, algorithms=[ALGORITHM])
+                employee_id = int(claims.get("sub"))
+            except (JWTError, TypeError, ValueError):
+                return False
+            if not claims.get("email"):
+                return False
+            # Same check as get_current_user: the role claim outlives a demotion until the token expires
+            async with ReadSessionLocal() as db:
+                emp = await load_active_employee(db, employee_id, claims["email"])
+            return emp is not None and emp.role == RoleEnum.Admin
+    return False
+
+
+async def _save(profile: Profile) -> None:
+    # The response has been sent by now; a failed save must not turn into a server error
+    try:
+        await store(profile)
+    except Exception:
+        log.exception(f"Could not store profile {profile.id}")
+
+
+class ProfilingMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        mode: Optional[bytes] = None
+        if scope["type"] == "http":
+            for name, value in scope["headers"]:
+                if name == b"x-profile":
+                    mode = value
+                    break
+        if mode is None or not await _is_admin(scope):
+            await self.app(scope, receive, send)
+            return
+
+        label = f"{scope['method']} {scope['path']}"
+        profiler: Optional[cProfile.Profile] = None
+        if mode.lower() == b"cprofile" and not _cprofile_running:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:  # 3.12+: another tool (debugger, coverage) holds the profiling hook
+                profiler = None
+        profile = Profile("pstats" if profiler else "collapsed", label, b"")
+
+        async def send_with_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[PROFILE_ID_HEADER] = profile.id
+            await send(message)
+
+        if profiler:
+            await self._run_cprofile(profiler, profile, scope, receive, send_with_id)
+            return
+
+        sampler = StackSampler(threading.get_ident())
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            profile.data = sampler.stop()
+            await _save(profile)
+
+    async def _run_cprofile(
+        self, profiler: cProfile.Profile, profile: Profile, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        global _cprofile_running
+        _cprofile_running = True
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            profiler.disable()
+            _cprofile_running = False
+            profiler.create_stats()
+            profile.data = marshal.dumps(profiler.stats)
+            await _save(profile)
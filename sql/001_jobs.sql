@@ -0,0 +1,20 @@
+-- Background job queue (app/jobs)
+DO $$ BEGIN
+    CREATE TYPE job_status_enum AS ENUM ('Queued', 'Running', 'Failed');
+EXCEPTION WHEN duplicate_object THEN NULL;
+END $$;
+
+CREATE TABLE IF NOT EXISTS jobs (
+    id           BIGSERIAL PRIMARY KEY,
+    kind         TEXT NOT NULL,
+    payload      JSONB NOT NULL DEFAULT '{}',
+    status       job_status_enum NOT NULL DEFAULT 'Queued',
+    attempts     INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 5,
+    run_at       TIMESTAMPTZ NOT NULL DEFAULT now(),
+    locked_at    TIMESTAMPTZ,
+    last_error   TEXT,
+    created_at   TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS ix_jobs_runnable ON jobs (run_at, id) WHERE status <> 'Failed';
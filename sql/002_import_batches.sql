@@ -0,0 +1,11 @@
+-- Resume checkpoints for the bulk importer (app/import_data.py)
+CREATE TABLE IF NOT EXISTS import_batches (
+    source      TEXT NOT NULL,
+    batch_no    INTEGER NOT NULL,
+    rows        INTEGER NOT NULL,
+    imported_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (source, batch_no)
+);
+
+-- Resuming is only valid with the batch size the source was started with
+ALTER TABLE import_batches ADD COLUMN IF NOT EXISTS batch_size INTEGER;
@@ -0,0 +1,8 @@
+-- Indexes for GET /customers/search: trigrams for ILIKE '%q%' on name (3+ characters) and
+-- ILIKE 'q%' on phone/email; a btree for lower(name) LIKE 'q%' (shorter terms)
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS ix_customers_name_trgm  ON customers USING gin (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_customers_phone_trgm ON customers USING gin (phone gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_customers_email_trgm ON customers USING gin (email gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_customers_name_lower_prefix ON customers (lower(name) text_pattern_ops);
@@ -0,0 +1,27 @@
+-- Archive tables for closed workorders and their tasks (app/archive.py)
+CREATE TABLE IF NOT EXISTS workorders_archive (
+    id          TEXT PRIMARY KEY,
+    vehicle     TEXT NOT NULL,
+    complaint   TEXT,
+    status      workorder_status_enum NOT NULL,
+    received    DATE,
+    due         DATE,
+    customer_id BIGINT REFERENCES customers (id) ON DELETE SET NULL,
+    created_at  TIMESTAMPTZ NOT NULL,
+    archived_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS tasks_archive (
+    id                   BIGINT PRIMARY KEY,
+    workorder_id         TEXT NOT NULL,
+    assigned_employee_id BIGINT,
+    name                 TEXT NOT NULL,
+    status               task_status_enum NOT NULL,
+    time_spent           TEXT,
+    created_at           TIMESTAMPTZ NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS ix_tasks_archive_workorder_id ON tasks_archive (workorder_id);
+
+-- Lets the mover find archivable rows without scanning open work
+CREATE INDEX IF NOT EXISTS ix_workorders_closed_created_at ON workorders (created_at) WHERE status = 'Afgerond';
@@ -0,0 +1,44 @@
+-- Delta sync: updated_at columns and deletion tombstones (app/sync.py)
+CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at := now();
+    RETURN NEW;
+END $$ LANGUAGE plpgsql;
+
+CREATE TABLE IF NOT EXISTS sync_tombstones (
+    table_name TEXT NOT NULL,
+    row_id     TEXT NOT NULL,
+    deleted_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (table_name, row_id)
+);
+CREATE INDEX IF NOT EXISTS ix_sync_tombstones_table_deleted_at ON sync_tombstones (table_name, deleted_at);
+
+CREATE OR REPLACE FUNCTION record_tombstone() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO sync_tombstones (table_name, row_id, deleted_at)
+    VALUES (TG_TABLE_NAME, OLD.id::text, now())
+    ON CONFLICT (table_name, row_id) DO UPDATE SET deleted_at = EXCLUDED.deleted_at;
+    RETURN OLD;
+END $$ LANGUAGE plpgsql;
+
+DO $$
+DECLARE t TEXT;
+BEGIN
+    FOREACH t IN ARRAY ARRAY['customers', 'workorders', 'tasks'] LOOP
+        EXECUTE format('ALTER TABLE %I ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ', t);
+        EXECUTE format('UPDATE %I SET updated_at = created_at WHERE updated_at IS NULL', t);
+        EXECUTE format('ALTER TABLE %I ALTER COLUMN updated_at SET DEFAULT now(), ALTER COLUMN updated_at SET NOT NULL', t);
+        EXECUTE format('CREATE INDEX IF NOT EXISTS ix_%s_updated_at ON %I (updated_at)', t, t);
+
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', t || '_set_updated_at', t);
+        EXECUTE format('CREATE TRIGGER %I BEFORE UPDATE ON %I FOR EACH ROW EXECUTE FUNCTION set_updated_at()',
+                       t || '_set_updated_at', t);
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', t || '_record_tombstone', t);
+        EXECUTE format('CREATE TRIGGER %I AFTER DELETE ON %I FOR EACH ROW EXECUTE FUNCTION record_tombstone()',
+                       t || '_record_tombstone', t);
+    END LOOP;
+END $$;
+
+-- The archive mover now selects on last change instead of creation time
+DROP INDEX IF EXISTS ix_workorders_closed_created_at;
+CREATE INDEX IF NOT EXISTS ix_workorders_closed_updated_at ON workorders (updated_at) WHERE status = 'Afgerond';
@@ -0,0 +1,15 @@
+-- Rotating refresh tokens (POST /auth/refresh)
+CREATE TABLE IF NOT EXISTS refresh_tokens (
+    id          BIGSERIAL PRIMARY KEY,
+    employee_id BIGINT NOT NULL REFERENCES employees (id) ON DELETE CASCADE,
+    family_id   UUID NOT NULL,
+    token_hash  VARCHAR(64) NOT NULL UNIQUE,
+    expires_at  TIMESTAMPTZ NOT NULL,
+    revoked_at  TIMESTAMPTZ,
+    created_at  TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS ix_refresh_tokens_employee_id ON refresh_tokens (employee_id);
+CREATE INDEX IF NOT EXISTS ix_refresh_tokens_family_id ON refresh_tokens (family_id);
+-- Expired tokens are deleted by the daily prune_refresh_tokens job
+CREATE INDEX IF NOT EXISTS ix_refresh_tokens_expires_at ON refresh_tokens (expires_at);
@@ -0,0 +1,20 @@
+-- Version of the employees table for the in-process employee directory (app/directory.py).
+-- A counter row rather than a timestamp or sequence: its new value only becomes visible
+-- when the change commits, and commits bump it in order, so a worker that reads the
+-- version before the rows never misses a change. (now() is the transaction start and
+-- nextval() is visible before commit; both can hide a change from the check.)
+CREATE TABLE IF NOT EXISTS employee_directory_version (
+    id      BOOLEAN PRIMARY KEY DEFAULT true CHECK (id),
+    version BIGINT NOT NULL DEFAULT 0
+);
+INSERT INTO employee_directory_version DEFAULT VALUES ON CONFLICT DO NOTHING;
+
+CREATE OR REPLACE FUNCTION bump_employee_directory_version() RETURNS trigger AS $$
+BEGIN
+    UPDATE employee_directory_version SET version = version + 1;
+    RETURN NULL;
+END $$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS employees_bump_directory_version ON employees;
+CREATE TRIGGER employees_bump_directory_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON employees
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_employee_directory_version();
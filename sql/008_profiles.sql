@@ -0,0 +1,9 @@
+-- Profiling reports (app/utils/profiling.py); only the newest PROFILES_KEPT are kept
+CREATE TABLE IF NOT EXISTS profiles (
+    id         VARCHAR(12) PRIMARY KEY,
+    kind       TEXT NOT NULL,
+    label      TEXT NOT NULL,
+    data       BYTEA NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS ix_profiles_created_at ON profiles (created_at);